@@ -8,26 +8,30 @@ __version__ = "1.0.0"
 __author__ = "Astra Technologies"
 __license__ = "Commercial"
 
+import importlib
 import os
-import sys
-from pathlib import Path
-
-# Add the project root to Python path
-PROJECT_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
 
 # Set up environment
 os.environ.setdefault("ASTRA_ENV", "development")
 
-# Import core components
-from .core.config import settings
-from .core.logging import setup_logging
-
-# Initialize logging
-setup_logging()
+# Core components are resolved lazily (PEP 562); logging is configured the
+# first time astra.core.logging is imported.
+_LAZY_ATTRS = {
+    "settings": ".core.config",
+    "setup_logging": ".core.logging",
+}
 
 # Export main components
 __all__ = [
     "settings",
     "setup_logging",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
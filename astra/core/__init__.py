@@ -1,13 +1,20 @@
 """
 Core components for Astra voice assistant.
+
+Components are imported lazily on first attribute access so that
+``import astra.core`` does not pull in the database, audio and AI stacks.
 """
 
-from .config import settings
-from .logging import setup_logging
-from .security import SecurityManager
-from .database import DatabaseManager
-from .audio import AudioManager
-from .ai import AIManager
+import importlib
+
+_LAZY_ATTRS = {
+    "settings": ".config",
+    "setup_logging": ".logging",
+    "SecurityManager": ".security",
+    "DatabaseManager": ".database",
+    "AudioManager": ".audio",
+    "AIManager": ".ai",
+}
 
 __all__ = [
     "settings",
@@ -16,4 +23,17 @@ __all__ = [
     "DatabaseManager",
     "AudioManager",
     "AIManager",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -2,113 +2,223 @@
 Configuration management for Astra voice assistant.
 """
 
+import json
 import os
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Optional, Dict, Any
-from pydantic import BaseSettings, Field
-from pydantic_settings import BaseSettings as PydanticBaseSettings
+from typing import Optional, Dict, Any, Callable, ClassVar, Set, Tuple, Union, get_args, get_origin, get_type_hints
 
 
-class Settings(PydanticBaseSettings):
+ENV_FILE = Path(".env")
+
+
+def _to_bool(value: str) -> bool:
+    """Parse a boolean environment value."""
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _csv_split(value: str) -> list:
+    """Parse a list environment value (JSON array or comma-separated)."""
+    value = value.strip()
+    if value.startswith("["):
+        return json.loads(value)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+_CASTERS: Dict[Any, Callable[[str], Any]] = {
+    bool: _to_bool,
+    int: int,
+    float: float,
+    str: str,
+    Path: Path,
+    list: _csv_split,
+}
+
+
+def _read_env_file(path: Path, encoding: str = "utf-8") -> Dict[str, str]:
+    """Parse KEY=VALUE pairs from a .env file (missing file yields no values)."""
+    values = {}
+    try:
+        with open(path, encoding=encoding) as f:
+            lines = f.readlines()
+    except OSError:
+        return values
+    
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("export "):
+            line = line[len("export "):].lstrip()
+        
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+            value = value[1:-1]
+        elif " #" in value:
+            value = value.split(" #", 1)[0].rstrip()
+        
+        values[key.strip().upper()] = value
+    return values
+
+
+def _env(name: str, default: Any = None, factory: Optional[Callable[[], Any]] = None) -> Any:
+    """Declare a settings field loaded from environment variable ``name``."""
+    if factory is not None:
+        return field(default_factory=factory, metadata={"env": name})
+    return field(default=default, metadata={"env": name})
+
+
+# Static part of Settings.get_feature_config; settings-dependent values
+# ("model", "audit_logging") are filled in per call
+_FEATURE_STATIC: Dict[str, Dict[str, Any]] = {
+    "voice_recognition": {
+        "enabled": True,
+        "offline_model": "vosk",
+        "online_model": "deepseek",
+        "confidence_threshold": 0.8,
+    },
+    "text_to_speech": {
+        "enabled": True,
+        "offline_model": "piper",
+        "online_model": "deepseek",
+        "voice_options": ["en-US", "en-GB", "es-ES", "fr-FR"],
+    },
+    "natural_language": {
+        "enabled": True,
+        "context_window": 4096,
+        "max_tokens": 2048,
+    },
+    "security": {
+        "encryption_enabled": True,
+        "hardware_fingerprinting": True,
+        "license_validation": True,
+    },
+}
+
+
+@dataclass(frozen=True)
+class Settings:
     """Main configuration settings for Astra."""
     
     # Application Settings
     app_name: str = "Astra"
     app_version: str = "1.0.0"
-    debug: bool = Field(default=False, env="ASTRA_DEBUG")
-    environment: str = Field(default="development", env="ASTRA_ENV")
+    debug: bool = _env("ASTRA_DEBUG", False)
+    environment: str = _env("ASTRA_ENV", "development")
     
     # Edition Settings
-    edition: str = Field(default="home", env="ASTRA_EDITION")  # "home" or "enterprise"
-    license_key: Optional[str] = Field(default=None, env="ASTRA_LICENSE_KEY")
+    edition: str = _env("ASTRA_EDITION", "home")  # "home" or "enterprise"
+    license_key: Optional[str] = _env("ASTRA_LICENSE_KEY")
     
     # Server Settings
-    host: str = Field(default="127.0.0.1", env="ASTRA_HOST")
-    port: int = Field(default=8000, env="ASTRA_PORT")
-    workers: int = Field(default=1, env="ASTRA_WORKERS")
+    host: str = _env("ASTRA_HOST", "127.0.0.1")
+    port: int = _env("ASTRA_PORT", 8000)
+    workers: int = _env("ASTRA_WORKERS", 1)
     
     # Database Settings
-    database_url: str = Field(default="sqlite:///astra.db", env="ASTRA_DATABASE_URL")
-    database_encryption_key: Optional[str] = Field(default=None, env="ASTRA_DB_ENCRYPTION_KEY")
+    database_url: str = _env("ASTRA_DATABASE_URL", "sqlite:///astra.db")
+    database_encryption_key: Optional[str] = _env("ASTRA_DB_ENCRYPTION_KEY")
     
     # AI Model Settings
-    deepseek_api_key: Optional[str] = Field(default=None, env="DEEPSEEK_API_KEY")
-    openrouter_api_key: Optional[str] = Field(default=None, env="OPENROUTER_API_KEY")
-    default_model: str = Field(default="deepseek-chat", env="ASTRA_DEFAULT_MODEL")
+    deepseek_api_key: Optional[str] = _env("DEEPSEEK_API_KEY")
+    openrouter_api_key: Optional[str] = _env("OPENROUTER_API_KEY")
+    default_model: str = _env("ASTRA_DEFAULT_MODEL", "deepseek-chat")
     
     # Audio Settings
-    sample_rate: int = Field(default=16000, env="ASTRA_SAMPLE_RATE")
-    chunk_size: int = Field(default=1024, env="ASTRA_CHUNK_SIZE")
-    wake_word: str = Field(default="hey astra", env="ASTRA_WAKE_WORD")
+    sample_rate: int = _env("ASTRA_SAMPLE_RATE", 16000)
+    chunk_size: int = _env("ASTRA_CHUNK_SIZE", 1024)
+    wake_word: str = _env("ASTRA_WAKE_WORD", "hey astra")
     
     # Security Settings
-    secret_key: str = Field(default="your-secret-key-here", env="ASTRA_SECRET_KEY")
-    encryption_key: Optional[str] = Field(default=None, env="ASTRA_ENCRYPTION_KEY")
-    jwt_secret: str = Field(default="your-jwt-secret-here", env="ASTRA_JWT_SECRET")
-    jwt_algorithm: str = Field(default="HS256", env="ASTRA_JWT_ALGORITHM")
-    jwt_expiration: int = Field(default=3600, env="ASTRA_JWT_EXPIRATION")
+    secret_key: str = _env("ASTRA_SECRET_KEY", "your-secret-key-here")
+    encryption_key: Optional[str] = _env("ASTRA_ENCRYPTION_KEY")
+    jwt_secret: str = _env("ASTRA_JWT_SECRET", "your-jwt-secret-here")
+    jwt_algorithm: str = _env("ASTRA_JWT_ALGORITHM", "HS256")
+    jwt_expiration: int = _env("ASTRA_JWT_EXPIRATION", 3600)
+    jwt_cache_enabled: bool = _env("ASTRA_JWT_CACHE_ENABLED", False)
     
     # File Storage Settings
-    data_dir: Path = Field(default=Path("./data"), env="ASTRA_DATA_DIR")
-    models_dir: Path = Field(default=Path("./models"), env="ASTRA_MODELS_DIR")
-    logs_dir: Path = Field(default=Path("./logs"), env="ASTRA_LOGS_DIR")
+    data_dir: Path = _env("ASTRA_DATA_DIR", Path("./data"))
+    models_dir: Path = _env("ASTRA_MODELS_DIR", Path("./models"))
+    logs_dir: Path = _env("ASTRA_LOGS_DIR", Path("./logs"))
     
     # Cache Settings
-    cache_enabled: bool = Field(default=True, env="ASTRA_CACHE_ENABLED")
-    cache_ttl: int = Field(default=3600, env="ASTRA_CACHE_TTL")
-    redis_url: Optional[str] = Field(default=None, env="ASTRA_REDIS_URL")
+    cache_enabled: bool = _env("ASTRA_CACHE_ENABLED", True)
+    cache_ttl: int = _env("ASTRA_CACHE_TTL", 3600)
+    redis_url: Optional[str] = _env("ASTRA_REDIS_URL")
     
     # API Settings
-    cors_origins: list = Field(default=["http://localhost:3000"], env="ASTRA_CORS_ORIGINS")
-    rate_limit_enabled: bool = Field(default=True, env="ASTRA_RATE_LIMIT_ENABLED")
-    rate_limit_requests: int = Field(default=100, env="ASTRA_RATE_LIMIT_REQUESTS")
-    rate_limit_window: int = Field(default=3600, env="ASTRA_RATE_LIMIT_WINDOW")
+    cors_origins: list = _env("ASTRA_CORS_ORIGINS", factory=lambda: ["http://localhost:3000"])
+    rate_limit_enabled: bool = _env("ASTRA_RATE_LIMIT_ENABLED", True)
+    rate_limit_requests: int = _env("ASTRA_RATE_LIMIT_REQUESTS", 100)
+    rate_limit_window: int = _env("ASTRA_RATE_LIMIT_WINDOW", 3600)
     
     # Logging Settings
-    log_level: str = Field(default="INFO", env="ASTRA_LOG_LEVEL")
-    log_format: str = Field(default="json", env="ASTRA_LOG_FORMAT")
+    log_level: str = _env("ASTRA_LOG_LEVEL", "INFO")
+    log_format: str = _env("ASTRA_LOG_FORMAT", "json")
     
     # Home Edition Settings
-    max_users_home: int = Field(default=5, env="ASTRA_MAX_USERS_HOME")
-    expansion_pack_price: float = Field(default=10.0, env="ASTRA_EXPANSION_PACK_PRICE")
-    expansion_pack_size: int = Field(default=5, env="ASTRA_EXPANSION_PACK_SIZE")
+    max_users_home: int = _env("ASTRA_MAX_USERS_HOME", 5)
+    expansion_pack_price: float = _env("ASTRA_EXPANSION_PACK_PRICE", 10.0)
+    expansion_pack_size: int = _env("ASTRA_EXPANSION_PACK_SIZE", 5)
     
     # Enterprise Edition Settings
-    enterprise_features_enabled: bool = Field(default=False, env="ASTRA_ENTERPRISE_FEATURES")
-    ldap_enabled: bool = Field(default=False, env="ASTRA_LDAP_ENABLED")
-    ldap_server: Optional[str] = Field(default=None, env="ASTRA_LDAP_SERVER")
-    ldap_bind_dn: Optional[str] = Field(default=None, env="ASTRA_LDAP_BIND_DN")
-    ldap_bind_password: Optional[str] = Field(default=None, env="ASTRA_LDAP_BIND_PASSWORD")
+    enterprise_features_enabled: bool = _env("ASTRA_ENTERPRISE_FEATURES", False)
+    ldap_enabled: bool = _env("ASTRA_LDAP_ENABLED", False)
+    ldap_server: Optional[str] = _env("ASTRA_LDAP_SERVER")
+    ldap_bind_dn: Optional[str] = _env("ASTRA_LDAP_BIND_DN")
+    ldap_bind_password: Optional[str] = _env("ASTRA_LDAP_BIND_PASSWORD")
     
     # External API Keys
-    openweather_api_key: Optional[str] = Field(default=None, env="OPENWEATHER_API_KEY")
-    google_api_key: Optional[str] = Field(default=None, env="GOOGLE_API_KEY")
-    stripe_secret_key: Optional[str] = Field(default=None, env="STRIPE_SECRET_KEY")
-    stripe_publishable_key: Optional[str] = Field(default=None, env="STRIPE_PUBLISHABLE_KEY")
+    openweather_api_key: Optional[str] = _env("OPENWEATHER_API_KEY")
+    google_api_key: Optional[str] = _env("GOOGLE_API_KEY")
+    stripe_secret_key: Optional[str] = _env("STRIPE_SECRET_KEY")
+    stripe_publishable_key: Optional[str] = _env("STRIPE_PUBLISHABLE_KEY")
     
     # Performance Settings
-    max_concurrent_requests: int = Field(default=100, env="ASTRA_MAX_CONCURRENT_REQUESTS")
-    request_timeout: int = Field(default=30, env="ASTRA_REQUEST_TIMEOUT")
-    memory_limit_mb: int = Field(default=512, env="ASTRA_MEMORY_LIMIT_MB")
+    max_concurrent_requests: int = _env("ASTRA_MAX_CONCURRENT_REQUESTS", 100)
+    request_timeout: int = _env("ASTRA_REQUEST_TIMEOUT", 30)
+    memory_limit_mb: int = _env("ASTRA_MEMORY_LIMIT_MB", 512)
     
     # Plugin Settings
-    plugins_enabled: bool = Field(default=True, env="ASTRA_PLUGINS_ENABLED")
-    plugin_dir: Path = Field(default=Path("./plugins"), env="ASTRA_PLUGIN_DIR")
-    plugin_sandbox_enabled: bool = Field(default=True, env="ASTRA_PLUGIN_SANDBOX")
+    plugins_enabled: bool = _env("ASTRA_PLUGINS_ENABLED", True)
+    plugin_dir: Path = _env("ASTRA_PLUGIN_DIR", Path("./plugins"))
+    plugin_sandbox_enabled: bool = _env("ASTRA_PLUGIN_SANDBOX", True)
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    # Directories already created by this process, shared by all instances
+    _ensured_dirs: ClassVar[Set[Path]] = set()
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    def __post_init__(self):
         self._ensure_directories()
     
+    @classmethod
+    def load(cls, env_file: Optional[Path] = ENV_FILE) -> "Settings":
+        """Load settings from the environment, falling back to the .env file."""
+        environ = _read_env_file(env_file) if env_file else {}
+        environ.update((key.upper(), value) for key, value in os.environ.items())
+        
+        values = {}
+        for name, (env_name, cast) in _ENV_MAP.items():
+            raw = environ.get(env_name)
+            if raw is None:
+                continue
+            try:
+                values[name] = cast(raw)
+            except ValueError as e:
+                raise ValueError(f"Invalid value for {env_name}: {raw!r}") from e
+        
+        return cls(**values)
+    
     def _ensure_directories(self):
         """Ensure required directories exist."""
-        for directory in [self.data_dir, self.models_dir, self.logs_dir, self.plugin_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+        for directory in (self.data_dir, self.models_dir, self.logs_dir, self.plugin_dir):
+            if directory not in Settings._ensured_dirs:
+                directory.mkdir(parents=True, exist_ok=True)
+                Settings._ensured_dirs.add(directory)
     
     @property
     def is_enterprise(self) -> bool:
@@ -132,34 +242,39 @@ class Settings(PydanticBaseSettings):
     
     def get_feature_config(self, feature_name: str) -> Dict[str, Any]:
         """Get feature-specific configuration."""
-        feature_configs = {
-            "voice_recognition": {
-                "enabled": True,
-                "offline_model": "vosk",
-                "online_model": "deepseek",
-                "confidence_threshold": 0.8,
-            },
-            "text_to_speech": {
-                "enabled": True,
-                "offline_model": "piper",
-                "online_model": "deepseek",
-                "voice_options": ["en-US", "en-GB", "es-ES", "fr-FR"],
-            },
-            "natural_language": {
-                "enabled": True,
-                "model": self.default_model,
-                "context_window": 4096,
-                "max_tokens": 2048,
-            },
-            "security": {
-                "encryption_enabled": True,
-                "hardware_fingerprinting": True,
-                "license_validation": True,
-                "audit_logging": self.is_enterprise,
-            },
+        config = _FEATURE_STATIC.get(feature_name)
+        if config is None:
+            return {}
+        
+        # Copy list values too so callers can't mutate the shared defaults
+        config = {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in config.items()
         }
-        return feature_configs.get(feature_name, {})
+        if feature_name == "natural_language":
+            config["model"] = self.default_model
+        elif feature_name == "security":
+            config["audit_logging"] = self.is_enterprise
+        return config
+
+
+def _build_env_map(cls) -> Dict[str, Tuple[str, Callable[[str], Any]]]:
+    """Map each settings field to its environment variable and caster."""
+    hints = get_type_hints(cls)
+    env_map = {}
+    for f in fields(cls):
+        env_name = f.metadata.get("env")
+        if env_name is None:
+            continue
+        field_type = hints[f.name]
+        if get_origin(field_type) is Union:
+            field_type = next(arg for arg in get_args(field_type) if arg is not type(None))
+        env_map[f.name] = (env_name, _CASTERS[field_type])
+    return env_map
+
+
+_ENV_MAP = _build_env_map(Settings)
 
 
 # Global settings instance
-settings = Settings() 
\ No newline at end of file
+settings = Settings.load() 
\ No newline at end of file
@@ -3,24 +3,148 @@ Database management for Astra voice assistant.
 """
 
 import asyncio
-from typing import Optional, Dict, Any, List
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 import json
 from datetime import datetime
 
-from sqlalchemy import create_engine, MetaData, Table, Column, String, Integer, DateTime, Text, Boolean
+from sqlalchemy import create_engine, event, insert, Index, MetaData, Table, Column, String, Integer, DateTime, Text, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool
 
 from .config import settings
 from .logging import get_logger
 from .security import security_manager
 
+try:
+    import orjson
+    
+    def _dumps_settings(value: Dict[str, Any]) -> str:
+        """Serialize user settings with orjson."""
+        return orjson.dumps(value).decode()
+    
+    _loads_settings = orjson.loads
+except ImportError:
+    def _dumps_settings(value: Dict[str, Any]) -> str:
+        """Serialize user settings with the stdlib json module."""
+        return json.dumps(value, separators=(",", ":"))
+    
+    _loads_settings = json.loads
+
 
 Base = declarative_base()
 
 
+# Prepared statements for hot paths that bypass the ORM
+_SQL_GET_USER_BY_ID = (
+    "SELECT id, username, email, hashed_password, role, is_active "
+    "FROM users WHERE id = ?"
+)
+_SQL_GET_USER_BY_USERNAME = (
+    "SELECT id, username, email, hashed_password, role, is_active "
+    "FROM users WHERE username = ?"
+)
+_SQL_USER_EXISTS = "SELECT 1 FROM users WHERE username = ? OR email = ? LIMIT 1"
+_SQL_GET_USER_SETTINGS = "SELECT settings FROM users WHERE id = ?"
+_SQL_UPDATE_LAST_LOGIN = "UPDATE users SET last_login = ? WHERE id = ?"
+_SQL_VALIDATE_SESSION = (
+    "SELECT id, user_id, session_token, expires_at, is_active FROM sessions "
+    "WHERE session_token = ? AND is_active = 1 AND expires_at > ? LIMIT 1"
+)
+_SQL_DEACTIVATE_USER_SESSIONS = (
+    "UPDATE sessions SET is_active = 0 WHERE user_id = ? AND is_active = 1"
+)
+_SQL_INSERT_SESSION = (
+    "INSERT INTO sessions (user_id, session_token, created_at, expires_at, is_active) "
+    "VALUES (?, ?, ?, ?, 1)"
+)
+_SQL_DEACTIVATE_SESSION = "UPDATE sessions SET is_active = 0 WHERE session_token = ?"
+_SQL_INSERT_AUDIT_LOG = (
+    "INSERT INTO audit_logs "
+    "(user_id, action, resource, details, ip_address, user_agent, timestamp) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# validate_session result cache: entries live at most this long (and never
+# past the session's own expiry)
+_SESSION_CACHE_TTL = 60.0
+_SESSION_CACHE_MAX_SIZE = 10_000
+
+# Pages copied per step of the online backup API; other connections can take
+# the database lock between steps
+_BACKUP_PAGES_PER_STEP = 1024
+
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    """Apply WAL and cache PRAGMAs to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _to_sql_datetime(value: datetime) -> str:
+    """Format a datetime the way SQLAlchemy's SQLite DateTime type stores it."""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+@dataclass(slots=True, frozen=True)
+class UserRow:
+    """Lightweight user record returned by every DatabaseManager user method.
+    
+    Read-only stand-in for the ORM ``User``: carries the columns the auth
+    paths need; settings are read via get_user_settings.
+    """
+    id: int
+    username: str
+    email: str
+    hashed_password: str
+    role: str
+    is_active: bool
+
+
+@dataclass(slots=True, frozen=True)
+class SessionRow:
+    """Lightweight session record returned by raw lookups."""
+    id: int
+    user_id: int
+    session_token: str
+    expires_at: datetime
+    is_active: bool
+
+
+def _user_row(row: tuple) -> UserRow:
+    """Build a UserRow from an (id, username, email, hashed_password, role, is_active) row."""
+    return UserRow(row[0], row[1], row[2], row[3], row[4], bool(row[5]))
+
+
+def _session_cache_key(session_token: str) -> bytes:
+    """Hash a session token into a compact cache key."""
+    return hashlib.blake2b(session_token.encode(), digest_size=16).digest()
+
+
+def _session_row(row: tuple) -> SessionRow:
+    """Build a SessionRow from a _SQL_VALIDATE_SESSION result."""
+    return SessionRow(row[0], row[1], row[2], datetime.fromisoformat(row[3]), bool(row[4]))
+
+
 class User(Base):
     """User model for authentication and management."""
     __tablename__ = "users"
@@ -33,12 +157,16 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime)
-    settings = Column(Text)  # JSON string for user preferences
+    settings = Column(Text)  # JSON string for user preferences; NULL means {}
 
 
 class Session(Base):
     """User session model."""
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Covers validate_session's token/active/expiry predicate
+        Index("ix_sessions_token_active", "session_token", "is_active", "expires_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, index=True)
@@ -51,6 +179,10 @@ class Session(Base):
 class AuditLog(Base):
     """Audit log model for enterprise edition."""
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Serves get_audit_logs' user filter ordered by timestamp
+        Index("ix_audit_user_time", "user_id", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, index=True)
@@ -65,6 +197,10 @@ class AuditLog(Base):
 class CalendarEvent(Base):
     """Calendar event model."""
     __tablename__ = "calendar_events"
+    __table_args__ = (
+        # Covers get_events' user filter and start/end range predicate
+        Index("ix_cal_user_range", "user_id", "start_time", "end_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, index=True)
@@ -120,34 +256,40 @@ class DatabaseManager:
         self.logger = get_logger("database")
         self.engine = None
         self.SessionLocal = None
+        self._conn = None
+        # DB-API module for raw connections; sqlcipher3 when encrypted
+        self._dbapi = sqlite3
+        self._db_path = settings.data_dir / "astra.db"
+        # Serializes use of the shared raw connection across threads
+        self._conn_lock = threading.RLock()
+        # token hash -> (monotonic expiry, SessionRow), kept in LRU order
+        self._session_cache: "OrderedDict[bytes, Tuple[float, SessionRow]]" = OrderedDict()
+        self._session_cache_lock = threading.Lock()
         self._initialize_database()
     
     def _initialize_database(self):
         """Initialize database connection."""
         try:
-            # Create database URL with encryption
+            engine_kwargs = {}
             if settings.database_encryption_key:
-                # Use SQLCipher for encryption
-                database_url = f"sqlite:///{settings.data_dir}/astra.db"
-                self.engine = create_engine(
-                    database_url,
-                    connect_args={
-                        "check_same_thread": False,
-                        "pragmas": {
-                            "key": settings.database_encryption_key,
-                            "cipher": "aes256",
-                        }
-                    },
-                    poolclass=StaticPool,
-                )
-            else:
-                # Use regular SQLite
-                database_url = f"sqlite:///{settings.data_dir}/astra.db"
-                self.engine = create_engine(
-                    database_url,
-                    connect_args={"check_same_thread": False},
-                    poolclass=StaticPool,
-                )
+                # SQLCipher is a drop-in sqlite3 replacement; the key is
+                # applied per connection by _configure_connection
+                import sqlcipher3
+                self._dbapi = sqlcipher3
+                engine_kwargs["module"] = sqlcipher3
+            
+            self.engine = create_engine(
+                f"sqlite:///{self._db_path}",
+                connect_args={"check_same_thread": False},
+                poolclass=QueuePool,
+                pool_size=settings.workers * 4,
+                max_overflow=16,
+                pool_pre_ping=True,
+                **engine_kwargs,
+            )
+            
+            # Key (if encrypted) then WAL so pooled connections read concurrently
+            event.listen(self.engine, "connect", self._configure_connection)
             
             # Create session factory
             self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
@@ -155,41 +297,90 @@ class DatabaseManager:
             # Create tables
             Base.metadata.create_all(bind=self.engine)
             
+            # create_all skips existing tables, so add indexes introduced
+            # after a database was first created
+            for table in (Session.__table__, AuditLog.__table__, CalendarEvent.__table__):
+                for index in table.indexes:
+                    index.create(bind=self.engine, checkfirst=True)
+            
+            # Raw connection for hot lookup paths
+            self._conn = self._connect_raw()
+            # Refresh planner statistics for the new indexes where needed
+            self._conn.execute("PRAGMA optimize")
+            
             self.logger.info("Database initialized successfully")
             
         except Exception as e:
             self.logger.error("Database initialization failed", error=str(e))
             raise
     
+    def _apply_key(self, dbapi_connection):
+        """Unlock an encrypted database; a no-op without an encryption key."""
+        key = settings.database_encryption_key
+        if key:
+            # PRAGMA key must be the first statement on the connection
+            escaped = key.replace("'", "''")
+            dbapi_connection.execute(f"PRAGMA key = '{escaped}'")
+    
+    def _configure_connection(self, dbapi_connection, connection_record=None):
+        """Unlock an encrypted database, then apply the standard PRAGMAs."""
+        self._apply_key(dbapi_connection)
+        _apply_sqlite_pragmas(dbapi_connection, connection_record)
+    
+    def _connect_raw(self) -> sqlite3.Connection:
+        """Open an autocommit connection to the application database."""
+        conn = self._dbapi.connect(
+            str(self._db_path),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._configure_connection(conn)
+        return conn
+    
+    @contextmanager
+    def _raw_transaction(self):
+        """Run statements on the raw connection inside one write transaction."""
+        with self._conn_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
     def get_session(self) -> Session:
         """Get database session."""
         return self.SessionLocal()
     
-    def create_user(self, username: str, email: str, password: str, role: str = "user") -> User:
+    def create_user(self, username: str, email: str, password: str, role: str = "user") -> UserRow:
         """Create a new user."""
         try:
-            with self.get_session() as session:
-                # Check if user already exists
-                existing_user = session.query(User).filter(
-                    (User.username == username) | (User.email == email)
-                ).first()
-                
-                if existing_user:
-                    raise ValueError("User already exists")
-                
-                # Create new user
-                hashed_password = security_manager.hash_password(password)
-                user = User(
-                    username=username,
-                    email=email,
-                    hashed_password=hashed_password,
-                    role=role,
-                    settings=json.dumps({})
-                )
-                
-                session.add(user)
+            # Check if user already exists
+            with self._conn_lock:
+                exists = self._conn.execute(_SQL_USER_EXISTS, (username, email)).fetchone()
+            if exists:
+                raise ValueError("User already exists")
+            
+            # Create new user
+            hashed_password = security_manager.hash_password(password)
+            # INSERT ... RETURNING hands back the defaulted columns, so no
+            # refresh SELECT; the row is shaped like the raw lookups' results
+            with self.SessionLocal() as session:
+                user = _user_row(session.execute(
+                    insert(User)
+                    .values(
+                        username=username,
+                        email=email,
+                        hashed_password=hashed_password,
+                        role=role,
+                    )
+                    .returning(
+                        User.id, User.username, User.email,
+                        User.hashed_password, User.role, User.is_active,
+                    )
+                ).one())
                 session.commit()
-                session.refresh(user)
                 
                 self.logger.info("User created successfully", username=username)
                 return user
@@ -198,41 +389,45 @@ class DatabaseManager:
             self.logger.error("User creation failed", error=str(e))
             raise
     
-    def authenticate_user(self, username: str, password: str) -> Optional[User]:
+    def authenticate_user(self, username: str, password: str) -> Optional[UserRow]:
         """Authenticate user with username and password."""
         try:
-            with self.get_session() as session:
-                user = session.query(User).filter(User.username == username).first()
-                
-                if user and security_manager.verify_password(password, user.hashed_password):
-                    # Update last login
-                    user.last_login = datetime.utcnow()
-                    session.commit()
-                    
-                    self.logger.info("User authenticated successfully", username=username)
-                    return user
+            with self._conn_lock:
+                row = self._conn.execute(_SQL_GET_USER_BY_USERNAME, (username,)).fetchone()
+            
+            if row and security_manager.verify_password(password, row[3]):
+                # Update last login
+                with self._conn_lock:
+                    self._conn.execute(
+                        _SQL_UPDATE_LAST_LOGIN, (_to_sql_datetime(datetime.utcnow()), row[0])
+                    )
                 
-                return None
+                self.logger.info("User authenticated successfully", username=username)
+                return _user_row(row)
+            
+            return None
                 
         except Exception as e:
             self.logger.error("User authentication failed", error=str(e))
             return None
     
-    def get_user_by_id(self, user_id: int) -> Optional[User]:
+    def get_user_by_id(self, user_id: int) -> Optional[UserRow]:
         """Get user by ID."""
         try:
-            with self.get_session() as session:
-                return session.query(User).filter(User.id == user_id).first()
-        except Exception as e:
+            with self._conn_lock:
+                row = self._conn.execute(_SQL_GET_USER_BY_ID, (user_id,)).fetchone()
+            return _user_row(row) if row else None
+        except self._dbapi.Error as e:
             self.logger.error("Failed to get user by ID", error=str(e))
             return None
     
-    def get_user_by_username(self, username: str) -> Optional[User]:
+    def get_user_by_username(self, username: str) -> Optional[UserRow]:
         """Get user by username."""
         try:
-            with self.get_session() as session:
-                return session.query(User).filter(User.username == username).first()
-        except Exception as e:
+            with self._conn_lock:
+                row = self._conn.execute(_SQL_GET_USER_BY_USERNAME, (username,)).fetchone()
+            return _user_row(row) if row else None
+        except self._dbapi.Error as e:
             self.logger.error("Failed to get user by username", error=str(e))
             return None
     
@@ -242,55 +437,107 @@ class DatabaseManager:
             with self.get_session() as session:
                 user = session.query(User).filter(User.id == user_id).first()
                 if user:
-                    user.settings = json.dumps(settings)
-                    session.commit()
+                    blob = _dumps_settings(settings) if settings else None
+                    # Skip the write (and WAL growth) when nothing changed
+                    if blob != user.settings:
+                        user.settings = blob
+                        session.commit()
                     return True
                 return False
         except Exception as e:
             self.logger.error("Failed to update user settings", error=str(e))
             return False
     
+    def get_user_settings(self, user_id: int) -> Dict[str, Any]:
+        """Get user settings, treating unset settings as empty."""
+        try:
+            with self._conn_lock:
+                row = self._conn.execute(_SQL_GET_USER_SETTINGS, (user_id,)).fetchone()
+            return _loads_settings(row[0]) if row and row[0] else {}
+        except (self._dbapi.Error, ValueError) as e:
+            self.logger.error("Failed to get user settings", error=str(e))
+            return {}
+    
     def create_session(self, user_id: int, session_token: str, expires_at: datetime) -> bool:
         """Create user session."""
         try:
-            with self.get_session() as session:
-                # Deactivate existing sessions for user
-                session.query(Session).filter(
-                    Session.user_id == user_id,
-                    Session.is_active == True
-                ).update({"is_active": False})
-                
-                # Create new session
-                new_session = Session(
-                    user_id=user_id,
-                    session_token=session_token,
-                    expires_at=expires_at
+            # Deactivate existing sessions and insert the new one in a single
+            # transaction: one commit, one write-lock hold
+            with self._raw_transaction() as conn:
+                conn.execute(_SQL_DEACTIVATE_USER_SESSIONS, (user_id,))
+                conn.execute(
+                    _SQL_INSERT_SESSION,
+                    (
+                        user_id,
+                        session_token,
+                        _to_sql_datetime(datetime.utcnow()),
+                        _to_sql_datetime(expires_at),
+                    ),
                 )
-                
-                session.add(new_session)
-                session.commit()
-                return True
+            self._evict_user_sessions(user_id)
+            return True
                 
         except Exception as e:
             self.logger.error("Failed to create session", error=str(e))
             return False
     
-    def validate_session(self, session_token: str) -> Optional[Session]:
+    def validate_session(self, session_token: str) -> Optional[SessionRow]:
         """Validate session token."""
+        key = _session_cache_key(session_token)
+        now_monotonic = time.monotonic()
+        
+        with self._session_cache_lock:
+            cached = self._session_cache.get(key)
+            if cached is not None:
+                if cached[0] > now_monotonic:
+                    self._session_cache.move_to_end(key)
+                    return cached[1]
+                del self._session_cache[key]
+        
         try:
-            with self.get_session() as session:
-                db_session = session.query(Session).filter(
-                    Session.session_token == session_token,
-                    Session.is_active == True,
-                    Session.expires_at > datetime.utcnow()
-                ).first()
-                
-                return db_session
+            now = datetime.utcnow()
+            with self._conn_lock:
+                row = self._conn.execute(
+                    _SQL_VALIDATE_SESSION, (session_token, _to_sql_datetime(now))
+                ).fetchone()
+            if not row:
+                return None
+            
+            db_session = _session_row(row)
+            remaining = (db_session.expires_at - now).total_seconds()
+            expiry = now_monotonic + min(_SESSION_CACHE_TTL, remaining)
+            with self._session_cache_lock:
+                self._session_cache[key] = (expiry, db_session)
+                self._session_cache.move_to_end(key)
+                if len(self._session_cache) > _SESSION_CACHE_MAX_SIZE:
+                    self._session_cache.popitem(last=False)
+            return db_session
                 
-        except Exception as e:
+        except (self._dbapi.Error, ValueError) as e:
+            # ValueError: a malformed expires_at in the row
             self.logger.error("Failed to validate session", error=str(e))
             return None
     
+    def deactivate_session(self, session_token: str) -> bool:
+        """Deactivate a session token (logout)."""
+        try:
+            with self._conn_lock:
+                self._conn.execute(_SQL_DEACTIVATE_SESSION, (session_token,))
+            with self._session_cache_lock:
+                self._session_cache.pop(_session_cache_key(session_token), None)
+            return True
+        except Exception as e:
+            self.logger.error("Failed to deactivate session", error=str(e))
+            return False
+    
+    def _evict_user_sessions(self, user_id: int):
+        """Drop cached validation results for all of a user's sessions."""
+        with self._session_cache_lock:
+            stale = [key for key, (_, db_session) in self._session_cache.items()
+                     if db_session.user_id == user_id]
+            for key in stale:
+                del self._session_cache[key]
+    
     def log_audit_event(self, user_id: int, action: str, resource: str, 
                        details: Dict[str, Any] = None, ip_address: str = None,
                        user_agent: str = None) -> bool:
@@ -299,19 +546,18 @@ class DatabaseManager:
             return True
         
         try:
-            with self.get_session() as session:
-                audit_log = AuditLog(
-                    user_id=user_id,
-                    action=action,
-                    resource=resource,
-                    details=json.dumps(details) if details else None,
-                    ip_address=ip_address,
-                    user_agent=user_agent
-                )
-                
-                session.add(audit_log)
-                session.commit()
-                return True
+            params = (
+                user_id,
+                action,
+                resource,
+                json.dumps(details) if details else None,
+                ip_address,
+                user_agent,
+                _to_sql_datetime(datetime.utcnow()),
+            )
+            with self._conn_lock:
+                self._conn.execute(_SQL_INSERT_AUDIT_LOG, params)
+            return True
                 
         except Exception as e:
             self.logger.error("Failed to log audit event", error=str(e))
@@ -343,9 +589,18 @@ class DatabaseManager:
     def backup_database(self, backup_path: Path) -> bool:
         """Create database backup."""
         try:
-            import shutil
-            source_db = settings.data_dir / "astra.db"
-            shutil.copy2(source_db, backup_path)
+            # Online backup: page-level copy that stays consistent while
+            # other connections keep writing
+            source = self._connect_raw()
+            try:
+                target = self._dbapi.connect(str(backup_path))
+                try:
+                    self._apply_key(target)
+                    source.backup(target, pages=_BACKUP_PAGES_PER_STEP)
+                finally:
+                    target.close()
+            finally:
+                source.close()
             
             self.logger.info("Database backup created", backup_path=str(backup_path))
             return True
@@ -357,9 +612,19 @@ class DatabaseManager:
     def restore_database(self, backup_path: Path) -> bool:
         """Restore database from backup."""
         try:
-            import shutil
-            target_db = settings.data_dir / "astra.db"
-            shutil.copy2(backup_path, target_db)
+            source = self._dbapi.connect(str(backup_path))
+            try:
+                self._apply_key(source)
+                with self._conn_lock:
+                    # Drop pooled connections so none hold stale pages, then
+                    # copy the backup onto the live database in place
+                    self.engine.dispose()
+                    source.backup(self._conn, pages=_BACKUP_PAGES_PER_STEP)
+            finally:
+                source.close()
+            
+            with self._session_cache_lock:
+                self._session_cache.clear()
             
             self.logger.info("Database restored from backup", backup_path=str(backup_path))
             return True
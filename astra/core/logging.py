@@ -2,23 +2,56 @@
 Logging configuration for Astra voice assistant.
 """
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
-import json
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
 
 from .config import settings
 
+try:
+    import orjson
+    
+    def _dumps(obj) -> str:
+        """Serialize a log entry with orjson."""
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    import json
+    
+    def _dumps(obj) -> str:
+        """Serialize a log entry with the stdlib json module."""
+        return json.dumps(obj, default=str)
+
 
 class StructuredFormatter(logging.Formatter):
     """Custom formatter for structured logging."""
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (epoch second, formatted UTC prefix) - replaced as one tuple so
+        # handlers on different threads never see a torn pair
+        self._second_cache = (-1, "")
+    
+    def _format_timestamp(self, created: float) -> str:
+        """Format record time as ISO-8601 UTC, reusing the per-second prefix."""
+        second = int(created)
+        cached_second, prefix = self._second_cache
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second_cache = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1e6):06d}"
+    
     def format(self, record):
         """Format log record as structured JSON."""
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -32,10 +65,107 @@ class StructuredFormatter(logging.Formatter):
             log_entry["exception"] = self.formatException(record.exc_info)
         
         # Add extra fields if present
-        if hasattr(record, "extra_fields"):
-            log_entry.update(record.extra_fields)
+        extra_fields = getattr(record, "extra_fields", None)
+        if extra_fields:
+            log_entry.update(extra_fields)
         
-        return json.dumps(log_entry)
+        return _dumps(log_entry)
+
+
+class _DailyFileHandler(logging.FileHandler):
+    """FileHandler writing to ``<prefix>_YYYYMMDD.log``, moving to a new file at local midnight."""
+    
+    def __init__(self, prefix: str):
+        self._prefix = prefix
+        now = time.time()
+        self._rollover_at = self._next_midnight(now)
+        super().__init__(self._file_for(now))
+    
+    def _file_for(self, timestamp: float) -> Path:
+        """Return the log file for the day containing timestamp."""
+        return settings.logs_dir / f"{self._prefix}_{datetime.fromtimestamp(timestamp):%Y%m%d}.log"
+    
+    @staticmethod
+    def _next_midnight(timestamp: float) -> float:
+        """Return the epoch time of the local midnight after timestamp."""
+        day = datetime.fromtimestamp(timestamp).date() + timedelta(days=1)
+        return datetime.combine(day, datetime.min.time()).timestamp()
+    
+    def emit(self, record):
+        """Switch to the new day's file once a record is past midnight."""
+        if record.created >= self._rollover_at:
+            self._rollover_at = self._next_midnight(record.created)
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+            self.baseFilename = os.path.abspath(self._file_for(record.created))
+        super().emit(record)
+
+# Shared QueueHandler feeding one process-wide QueueListener
+_QUEUE_HANDLER: Optional[logging.Handler] = None
+_QUEUE_HANDLER_LOCK = threading.Lock()
+
+
+def _create_handlers() -> List[logging.Handler]:
+    """Create the console, file, error and audit handlers."""
+    handlers = []
+    
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    
+    if settings.log_format == "json":
+        console_formatter = StructuredFormatter()
+    else:
+        console_formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+    
+    console_handler.setFormatter(console_formatter)
+    handlers.append(console_handler)
+    
+    # File handler for all logs
+    file_handler = _DailyFileHandler("astra")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(StructuredFormatter())
+    handlers.append(file_handler)
+    
+    # Error file handler
+    error_handler = _DailyFileHandler("astra_errors")
+    error_handler.setLevel(logging.ERROR)
+    error_handler.setFormatter(StructuredFormatter())
+    handlers.append(error_handler)
+    
+    # Enterprise audit logging
+    if settings.is_enterprise:
+        audit_handler = _DailyFileHandler("astra_audit")
+        audit_handler.setLevel(logging.INFO)
+        audit_handler.setFormatter(StructuredFormatter())
+        handlers.append(audit_handler)
+    
+    return handlers
+
+
+def _get_queue_handler() -> logging.Handler:
+    """Return the shared QueueHandler, starting its listener on first use.
+    
+    Handlers run on a background QueueListener thread; loggers only get the
+    QueueHandler so callers never block on console/disk I/O, and each log
+    file is opened exactly once per process.
+    """
+    global _QUEUE_HANDLER
+    if _QUEUE_HANDLER is None:
+        with _QUEUE_HANDLER_LOCK:
+            if _QUEUE_HANDLER is None:
+                log_queue = queue.SimpleQueue()
+                listener = logging.handlers.QueueListener(
+                    log_queue, *_create_handlers(), respect_handler_level=True
+                )
+                listener.start()
+                # Drain queued records before interpreter shutdown
+                atexit.register(listener.stop)
+                _QUEUE_HANDLER = logging.handlers.QueueHandler(log_queue)
+    return _QUEUE_HANDLER
 
 
 class AstraLogger:
@@ -47,45 +177,7 @@ class AstraLogger:
         
         # Prevent duplicate handlers
         if not self.logger.handlers:
-            self._setup_handlers()
-    
-    def _setup_handlers(self):
-        """Set up logging handlers."""
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        
-        if settings.log_format == "json":
-            console_formatter = StructuredFormatter()
-        else:
-            console_formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
-        
-        console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
-        
-        # File handler for all logs
-        log_file = settings.logs_dir / f"astra_{datetime.now().strftime('%Y%m%d')}.log"
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(StructuredFormatter())
-        self.logger.addHandler(file_handler)
-        
-        # Error file handler
-        error_file = settings.logs_dir / f"astra_errors_{datetime.now().strftime('%Y%m%d')}.log"
-        error_handler = logging.FileHandler(error_file)
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(StructuredFormatter())
-        self.logger.addHandler(error_handler)
-        
-        # Enterprise audit logging
-        if settings.is_enterprise:
-            audit_file = settings.logs_dir / f"astra_audit_{datetime.now().strftime('%Y%m%d')}.log"
-            audit_handler = logging.FileHandler(audit_file)
-            audit_handler.setLevel(logging.INFO)
-            audit_handler.setFormatter(StructuredFormatter())
-            self.logger.addHandler(audit_handler)
+            self.logger.addHandler(_get_queue_handler())
     
     def debug(self, message: str, **kwargs):
         """Log debug message."""
@@ -109,12 +201,15 @@ class AstraLogger:
     
     def _log_with_extra(self, level: int, message: str, **kwargs):
         """Log message with extra fields."""
-        record = self.logger.makeRecord(
-            self.logger.name, level, "", 0, message, (), None
+        if not self.logger.isEnabledFor(level):
+            return
+        # stacklevel=3 attributes the record to the caller of debug()/info()/...
+        self.logger.log(
+            level,
+            message,
+            extra={"extra_fields": kwargs} if kwargs else None,
+            stacklevel=3,
         )
-        if kwargs:
-            record.extra_fields = kwargs
-        self.logger.handle(record)
     
     def audit(self, action: str, user: str, resource: str, **kwargs):
         """Log audit event (Enterprise only)."""
@@ -140,14 +235,25 @@ class AstraLogger:
         self.warning("SECURITY_EVENT", **security_data)
 
 
+# Loggers are cached by name so handler setup runs once per logger
+_LOGGER_CACHE: Dict[str, AstraLogger] = {}
+_LOGGER_CACHE_LOCK = threading.Lock()
+
+
 def setup_logging(name: str = "astra") -> AstraLogger:
     """Set up and return Astra logger."""
-    return AstraLogger(name)
+    return get_logger(name)
 
 
 def get_logger(name: str = "astra") -> AstraLogger:
     """Get Astra logger instance."""
-    return AstraLogger(name)
+    logger = _LOGGER_CACHE.get(name)
+    if logger is None:
+        with _LOGGER_CACHE_LOCK:
+            logger = _LOGGER_CACHE.get(name)
+            if logger is None:
+                logger = _LOGGER_CACHE[name] = AstraLogger(name)
+    return logger
 
 
 # Global logger instance
@@ -6,53 +6,176 @@ import hashlib
 import hmac
 import os
 import platform
+import re
+import secrets
+import threading
+import time
 import uuid
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import json
 import base64
 
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import jwt
 
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 from .config import settings
 from .logging import get_logger
 
 
+# Random PBKDF2 salt, created on first run, relative to settings.data_dir
+_KDF_SALT_FILE = "encryption.salt"
+_KDF_SALT_SIZE = 16
+_KDF_ITERATIONS = 100_000
+# Derived-key cache written by earlier builds; it held a fast hash of the
+# secret key next to the key itself, so it is removed on startup
+_LEGACY_KEY_FILE = "encryption.key"
+
+# AES-GCM nonce length in bytes (96 bits, the size GCM is specified for)
+_GCM_NONCE_SIZE = 12
+# HKDF label separating the AES-GCM key from the master (Fernet) key
+_GCM_KEY_INFO = b"astra/aes-256-gcm/v1"
+
+# verify_jwt_token cache (opt-in via settings.jwt_cache_enabled): entries live
+# at most this long, and never past the token's own exp
+_JWT_CACHE_TTL = 5.0
+_JWT_CACHE_MAX_SIZE = 4096
+
+# Markup/script injection patterns rejected by validate_input
+_DANGEROUS_INPUT_PATTERN = re.compile(
+    r"<script|javascript:|data:|vbscript:|on(?:load|error|click)=", re.IGNORECASE
+)
+
+# Characters sanitize_filename replaces with "_"
+_FILENAME_TRANSLATION = str.maketrans({char: "_" for char in '<>:"|?*\\/'})
+
+# Every Fernet token starts with version byte 0x80, which base64-encodes to "gA"
+_FERNET_TOKEN_PREFIX = b"gA"
+
+
+def _b64url_encode(data: bytes) -> str:
+    """Encode bytes as unpadded urlsafe base64."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64url_decode(data: str) -> bytes:
+    """Decode unpadded urlsafe base64."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
 class SecurityManager:
     """Manages security features for Astra."""
     
     def __init__(self):
         self.logger = get_logger("security")
         self._encryption_key = None
+        self._aead = None
         self._fernet = None
+        # Hardware doesn't change under a running process; probe it once
+        self._hw_fingerprint: Optional[str] = None
+        # JWT parameters resolved once for the token hot paths
+        self._jwt_secret = settings.jwt_secret.encode()
+        self._jwt_algorithm = settings.jwt_algorithm
+        self._jwt_algorithms = [settings.jwt_algorithm]
+        self._jwt_expiration = settings.jwt_expiration
+        # sha256(token) -> (payload, wall-clock expiry), kept in LRU order
+        self._jwt_cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._jwt_cache_lock = threading.Lock()
         self._initialize_encryption()
     
     def _initialize_encryption(self):
         """Initialize encryption components."""
         if settings.encryption_key:
+            # Configured keys are already urlsafe-base64 Fernet keys
             key = settings.encryption_key.encode()
+            self._fernet = Fernet(key)
         else:
-            # Generate key from secret key
-            salt = settings.secret_key.encode()
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-            )
-            key = base64.urlsafe_b64encode(kdf.derive(settings.secret_key.encode()))
+            self._remove_legacy_key_file()
+            key = self._derive_key(self._load_salt())
         
         self._encryption_key = key
-        self._fernet = Fernet(key)
+        # AES-256-GCM gets its own HKDF subkey so no key material is shared
+        # with Fernet, which is kept only to read data written before the switch
+        self._aead = AESGCM(HKDF(
+            algorithm=hashes.SHA256(), length=32, salt=None, info=_GCM_KEY_INFO,
+        ).derive(base64.urlsafe_b64decode(key)))
+    
+    @staticmethod
+    def _derive_key(salt: bytes) -> bytes:
+        """Derive a urlsafe-base64 key from the secret key with PBKDF2."""
+        return base64.urlsafe_b64encode(hashlib.pbkdf2_hmac(
+            "sha256", settings.secret_key.encode(), salt, _KDF_ITERATIONS, dklen=32
+        ))
+    
+    def _load_salt(self) -> bytes:
+        """Return the persisted KDF salt, creating it on first run."""
+        salt_file = settings.data_dir / _KDF_SALT_FILE
+        try:
+            salt = salt_file.read_bytes()
+            if salt:
+                return salt
+        except FileNotFoundError:
+            pass
+        
+        # Write the salt to a temp file, then link it into place: the link
+        # fails if another process got there first, and readers never see a
+        # partially written salt
+        salt = os.urandom(_KDF_SALT_SIZE)
+        tmp_file = salt_file.with_name(f"{_KDF_SALT_FILE}.{os.getpid()}.tmp")
+        try:
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(salt)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.link(tmp_file, salt_file)
+            except FileExistsError:
+                salt = salt_file.read_bytes()
+            finally:
+                tmp_file.unlink()
+            return salt
+        except OSError as e:
+            # Without a persisted salt the key would change every run and
+            # strand whatever was encrypted under it
+            self.logger.error("Could not persist encryption salt", error=str(e))
+            raise
+    
+    def _remove_legacy_key_file(self):
+        """Delete the derived-key cache written by earlier builds."""
+        try:
+            (settings.data_dir / _LEGACY_KEY_FILE).unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.warning("Could not remove legacy encryption key cache", error=str(e))
+    
+    def _legacy_fernet(self) -> Fernet:
+        """Fernet for tokens written before AES-GCM, derived on first use."""
+        if self._fernet is None:
+            # Those tokens used the secret key as its own PBKDF2 salt
+            self._fernet = Fernet(self._derive_key(settings.secret_key.encode()))
+        return self._fernet
     
     def encrypt_data(self, data: str) -> str:
         """Encrypt data using AES-256."""
         try:
-            encrypted_data = self._fernet.encrypt(data.encode())
-            return base64.b64encode(encrypted_data).decode()
+            nonce = os.urandom(_GCM_NONCE_SIZE)
+            ciphertext = self._aead.encrypt(nonce, data.encode(), None)
+            return base64.b64encode(nonce + ciphertext).decode()
         except Exception as e:
             self.logger.error("Encryption failed", error=str(e))
             raise
@@ -60,45 +183,52 @@ class SecurityManager:
     def decrypt_data(self, encrypted_data: str) -> str:
         """Decrypt data using AES-256."""
         try:
-            decoded_data = base64.b64decode(encrypted_data.encode())
-            decrypted_data = self._fernet.decrypt(decoded_data)
-            return decrypted_data.decode()
+            token = encrypted_data.encode()
+            try:
+                blob = base64.b64decode(token)
+                return self._aead.decrypt(
+                    blob[:_GCM_NONCE_SIZE], blob[_GCM_NONCE_SIZE:], None
+                ).decode()
+            except (InvalidTag, ValueError):
+                # Fernet token from before the switch to AES-GCM
+                pass
+            if not token.startswith(_FERNET_TOKEN_PREFIX):
+                # Data written before tokens were stored unwrapped
+                token = base64.b64decode(token)
+            return self._legacy_fernet().decrypt(token).decode()
         except Exception as e:
             self.logger.error("Decryption failed", error=str(e))
             raise
     
     def generate_hardware_fingerprint(self) -> str:
         """Generate unique hardware fingerprint."""
+        if self._hw_fingerprint is not None:
+            return self._hw_fingerprint
         try:
-            # Collect system information
-            system_info = {
-                "platform": platform.system(),
-                "platform_version": platform.version(),
-                "machine": platform.machine(),
-                "processor": platform.processor(),
-                "node": platform.node(),
-            }
-            
-            # Get MAC address
-            mac_address = ':'.join(['{:02x}'.format((uuid.getnode() >> elements) & 0xff)
-                                  for elements in range(0,2*6,2)][::-1])
-            system_info["mac_address"] = mac_address
+            # Collect system information in a fixed order
+            fields = [
+                platform.system(),
+                platform.version(),
+                platform.machine(),
+                platform.processor(),
+                platform.node(),
+                # MAC address
+                '%012x' % uuid.getnode(),
+            ]
             
             # Get CPU info
-            try:
-                import psutil
-                cpu_info = {
-                    "cpu_count": psutil.cpu_count(),
-                    "cpu_freq": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None,
-                }
-                system_info.update(cpu_info)
-            except ImportError:
-                pass
+            if psutil is not None:
+                fields.append(str(psutil.cpu_count()))
             
-            # Generate fingerprint
-            fingerprint_data = json.dumps(system_info, sort_keys=True)
-            fingerprint = hashlib.sha256(fingerprint_data.encode()).hexdigest()
+            # Generate fingerprint; the unit separator keeps field boundaries
+            # unambiguous
+            digest = hashlib.sha256()
+            for value in fields:
+                digest.update(value.encode())
+                digest.update(b'\x1f')
+            fingerprint = digest.hexdigest()
             
+            self._hw_fingerprint = fingerprint
             return fingerprint
         except Exception as e:
             self.logger.error("Hardware fingerprint generation failed", error=str(e))
@@ -107,14 +237,11 @@ class SecurityManager:
     def validate_license(self, license_key: str) -> Dict[str, Any]:
         """Validate license key and return license info."""
         try:
-            # Decode license key
-            decoded_key = base64.b64decode(license_key.encode())
-            license_data = json.loads(decoded_key.decode())
-            
-            # Verify signature
-            expected_signature = self._generate_license_signature(license_data)
-            if license_data.get("signature") != expected_signature:
-                raise ValueError("Invalid license signature")
+            # Decode license key and verify signature
+            if "." in license_key:
+                license_data = self._decode_license(license_key)
+            else:
+                license_data = self._decode_legacy_license(license_key)
             
             # Check expiration
             expiration_date = datetime.fromisoformat(license_data["expiration"])
@@ -132,20 +259,44 @@ class SecurityManager:
             self.logger.error("License validation failed", error=str(e))
             raise
     
-    def _generate_license_signature(self, license_data: Dict[str, Any]) -> str:
-        """Generate license signature for validation."""
+    def _decode_license(self, license_key: str) -> Dict[str, Any]:
+        """Verify a b64(payload).b64(signature) license and return its payload."""
+        payload_b64, _, signature_b64 = license_key.partition(".")
+        payload = _b64url_decode(payload_b64)
+        
+        # The HMAC covers the payload bytes exactly as issued, so nothing is
+        # re-serialized to check it
+        expected_signature = self._license_signature_raw(payload)
+        if not hmac.compare_digest(_b64url_decode(signature_b64), expected_signature):
+            raise ValueError("Invalid license signature")
+        
+        return json.loads(payload)
+    
+    def _decode_legacy_license(self, license_key: str) -> Dict[str, Any]:
+        """Verify a base64 JSON license with an embedded signature field."""
+        decoded_key = base64.b64decode(license_key.encode())
+        license_data = json.loads(decoded_key.decode())
+        
+        try:
+            signature = bytes.fromhex(license_data.get("signature") or "")
+        except (TypeError, ValueError):
+            raise ValueError("Invalid license signature")
+        expected_signature = self._generate_license_signature_raw(license_data)
+        if not hmac.compare_digest(signature, expected_signature):
+            raise ValueError("Invalid license signature")
+        
+        return license_data
+    
+    def _license_signature_raw(self, payload: bytes) -> bytes:
+        """Return the raw HMAC-SHA256 of license payload bytes."""
+        return hmac.new(settings.secret_key.encode(), payload, hashlib.sha256).digest()
+    
+    def _generate_license_signature_raw(self, license_data: Dict[str, Any]) -> bytes:
+        """Generate the raw legacy license signature for validation."""
         # Remove signature from data for signing
         data_to_sign = {k: v for k, v in license_data.items() if k != "signature"}
         data_string = json.dumps(data_to_sign, sort_keys=True)
-        
-        # Generate HMAC signature
-        signature = hmac.new(
-            settings.secret_key.encode(),
-            data_string.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        
-        return signature
+        return self._license_signature_raw(data_string.encode())
     
     def generate_license(self, edition: str, user_count: int, 
                         expiration_days: int = 365) -> str:
@@ -160,14 +311,12 @@ class SecurityManager:
                 "license_id": str(uuid.uuid4()),
             }
             
-            # Generate signature
-            license_data["signature"] = self._generate_license_signature(license_data)
+            # Sign the exact payload bytes that will be shipped
+            payload = json.dumps(license_data, separators=(",", ":")).encode()
+            signature = self._license_signature_raw(payload)
             
             # Encode license
-            license_json = json.dumps(license_data)
-            encoded_license = base64.b64encode(license_json.encode()).decode()
-            
-            return encoded_license
+            return f"{_b64url_encode(payload)}.{_b64url_encode(signature)}"
         except Exception as e:
             self.logger.error("License generation failed", error=str(e))
             raise
@@ -175,14 +324,16 @@ class SecurityManager:
     def create_jwt_token(self, user_id: str, user_role: str = "user") -> str:
         """Create JWT token for user authentication."""
         try:
+            # NumericDate claims are plain epoch seconds (RFC 7519)
+            now = int(time.time())
             payload = {
                 "user_id": user_id,
                 "role": user_role,
-                "exp": datetime.utcnow() + timedelta(seconds=settings.jwt_expiration),
-                "iat": datetime.utcnow(),
+                "exp": now + self._jwt_expiration,
+                "iat": now,
             }
             
-            token = jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+            token = jwt.encode(payload, self._jwt_secret, algorithm=self._jwt_algorithm)
             return token
         except Exception as e:
             self.logger.error("JWT token creation failed", error=str(e))
@@ -190,8 +341,25 @@ class SecurityManager:
     
     def verify_jwt_token(self, token: str) -> Dict[str, Any]:
         """Verify JWT token and return payload."""
+        if settings.jwt_cache_enabled:
+            key = hashlib.sha256(token.encode()).digest()
+            with self._jwt_cache_lock:
+                hit = self._jwt_cache.get(key)
+                if hit is not None:
+                    if hit[1] > time.time():
+                        self._jwt_cache.move_to_end(key)
+                        return dict(hit[0])
+                    del self._jwt_cache[key]
+        
         try:
-            payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+            payload = jwt.decode(token, self._jwt_secret, algorithms=self._jwt_algorithms)
+            if settings.jwt_cache_enabled and "exp" in payload:
+                # Never outlive the token itself
+                expiry = min(payload["exp"], time.time() + _JWT_CACHE_TTL)
+                with self._jwt_cache_lock:
+                    self._jwt_cache[key] = (dict(payload), expiry)
+                    if len(self._jwt_cache) > _JWT_CACHE_MAX_SIZE:
+                        self._jwt_cache.popitem(last=False)
             return payload
         except jwt.ExpiredSignatureError:
             raise ValueError("Token expired")
@@ -201,27 +369,27 @@ class SecurityManager:
     
     def hash_password(self, password: str) -> str:
         """Hash password using bcrypt."""
-        try:
-            import bcrypt
+        if bcrypt is not None:
             salt = bcrypt.gensalt()
             hashed = bcrypt.hashpw(password.encode(), salt)
             return hashed.decode()
-        except ImportError:
-            # Fallback to simple hash if bcrypt not available
-            return hashlib.sha256(password.encode()).hexdigest()
+        # Fallback to simple hash if bcrypt not available
+        return hashlib.sha256(password.encode()).hexdigest()
     
     def verify_password(self, password: str, hashed_password: str) -> bool:
         """Verify password against hash."""
-        try:
-            import bcrypt
+        if bcrypt is not None:
             return bcrypt.checkpw(password.encode(), hashed_password.encode())
-        except ImportError:
-            # Fallback verification
-            return hashlib.sha256(password.encode()).hexdigest() == hashed_password
+        # Fallback verification, constant-time to avoid a timing side channel
+        try:
+            expected = bytes.fromhex(hashed_password)
+        except ValueError:
+            return False
+        return hmac.compare_digest(hashlib.sha256(password.encode()).digest(), expected)
     
     def generate_secure_token(self, length: int = 32) -> str:
         """Generate secure random token."""
-        return base64.b64encode(os.urandom(length)).decode()
+        return secrets.token_urlsafe(length)
     
     def validate_input(self, data: str, max_length: int = 1000) -> bool:
         """Validate user input for security."""
@@ -229,24 +397,12 @@ class SecurityManager:
             return False
         
         # Check for potential injection patterns
-        dangerous_patterns = [
-            "<script", "javascript:", "data:", "vbscript:", 
-            "onload=", "onerror=", "onclick="
-        ]
-        
-        data_lower = data.lower()
-        for pattern in dangerous_patterns:
-            if pattern in data_lower:
-                return False
-        
-        return True
+        return _DANGEROUS_INPUT_PATTERN.search(data) is None
     
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for security."""
         # Remove dangerous characters
-        dangerous_chars = ['<', '>', ':', '"', '|', '?', '*', '\\', '/']
-        for char in dangerous_chars:
-            filename = filename.replace(char, '_')
+        filename = filename.translate(_FILENAME_TRANSLATION)
         
         # Limit length
         if len(filename) > 255:
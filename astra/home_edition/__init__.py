@@ -8,13 +8,29 @@ __version__ = "1.0.0"
 __edition__ = "home"
 __license__ = "Free for personal use"
 
-import os
+import asyncio
 import sys
-from pathlib import Path
+from typing import Any, Coroutine, TypeVar
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+_T = TypeVar("_T")
+
+
+def run(main: Coroutine[Any, Any, _T]) -> _T:
+    """Run an entry-point coroutine, on uvloop where it is available.
+    
+    Only the loop this call creates uses uvloop; the global event loop
+    policy of an embedding application is left alone.
+    """
+    if uvloop is None:
+        return asyncio.run(main)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(main)
 
-# Add the project root to Python path
-PROJECT_ROOT = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
 
 # Import core components
 from astra.core.config import settings
@@ -44,4 +60,5 @@ __all__ = [
     "HomeFeatures", 
     "HomeServer",
     "drm_protection",
+    "run",
 ] 
\ No newline at end of file
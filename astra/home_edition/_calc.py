@@ -0,0 +1,35 @@
+"""
+Shared checks for the Home Edition's whitelisted AST calculators.
+"""
+
+import ast
+
+# Largest exponent a calculator expression may use; integer powers grow
+# without bound, so e.g. 9**9**9 would otherwise pin a CPU
+MAX_EXPONENT = 1024
+
+
+def check_constant(node: ast.Constant):
+    """Reject constants other than numbers (strings, bytes, None, ...)."""
+    if type(node.value) not in (int, float):
+        raise ValueError(f"Unsupported constant: {node.value!r}")
+
+
+def check_power(node: ast.BinOp):
+    """Reject powers whose result size isn't bounded by MAX_EXPONENT."""
+    exponent = node.right
+    if isinstance(exponent, ast.UnaryOp):
+        exponent = exponent.operand
+    if not (isinstance(exponent, ast.Constant) and type(exponent.value) in (int, float)
+            and abs(exponent.value) <= MAX_EXPONENT):
+        raise ValueError(f"Exponent must be a number no larger than {MAX_EXPONENT}")
+    if any(isinstance(inner, ast.BinOp) and isinstance(inner.op, ast.Pow)
+           for inner in ast.walk(node.left)):
+        raise ValueError("Nested powers are not supported")
+
+
+def check_repetition(node: ast.BinOp):
+    """Reject multiplying anything built from tuples (sequence repetition)."""
+    if any(isinstance(inner, ast.Tuple)
+           for operand in (node.left, node.right) for inner in ast.walk(operand)):
+        raise ValueError("Tuples cannot be multiplied")
@@ -0,0 +1,326 @@
+"""
+Shared HTTP plumbing for the network-bound Home Edition features: one pooled
+requests session, one aiohttp session per event loop and one response cache
+(in-process LRU in front of diskcache) used by HomeFeatures and the feature
+modules alike.
+"""
+
+import asyncio
+import atexit
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from astra.core.config import settings
+from astra.core.logging import get_logger
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+logger = get_logger("astra.home.http")
+
+# Total per-request budget, matching the sync features' 10 s timeout
+REQUEST_TIMEOUT = 10
+
+# Expired cache entries are kept this long to serve when the API fails
+_STALE_GRACE = 86400
+_MEMORY_CACHE_SIZE = 4096
+_DISK_CACHE_SIZE = 256 * 1024 * 1024
+# Back-off applied to a 429 that carries no usable Retry-After
+_DEFAULT_RETRY_AFTER = 60.0
+
+_USER_AGENT = "Astra/1.0"
+
+# host -> wall-clock time before which cached data is served even if expired
+_retry_until: Dict[str, float] = {}
+
+# key -> (expires_at, value), least recently used first
+_memory_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+class _AiohttpMissing(Exception):
+    """Stand-in for aiohttp.ClientError, raised by get_session without aiohttp."""
+
+
+# requests and aiohttp are imported on first use, so importing this module
+# for the cache (as HomeFeatures does) doesn't pay for them
+
+
+@functools.lru_cache(maxsize=None)
+def _aiohttp():
+    """Import aiohttp on first use, or return None if it isn't installed."""
+    try:
+        import aiohttp
+    except ImportError:
+        return None
+    return aiohttp
+
+
+def __getattr__(name: str):
+    """Resolve ``SESSION`` and ``ClientError`` on first access (PEP 562)."""
+    if name == "SESSION":
+        return sync_session()
+    if name == "ClientError":
+        aiohttp = _aiohttp()
+        return _AiohttpMissing if aiohttp is None else aiohttp.ClientError
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _retry_after_seconds(value: Optional[str]) -> float:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            pass
+    return _DEFAULT_RETRY_AFTER
+
+
+def _note_rate_limit(host: Optional[str], retry_after: Optional[str]) -> None:
+    """Remember that host asked us to back off."""
+    if host:
+        _retry_until[host] = time.time() + _retry_after_seconds(retry_after)
+
+
+def _record_rate_limit(response, *args, **kwargs):
+    """requests response hook recording 429 back-offs."""
+    if response.status_code == 429:
+        _note_rate_limit(urlsplit(response.url).hostname, response.headers.get("Retry-After"))
+
+
+async def _arecord_rate_limit(session, context, params) -> None:
+    """aiohttp trace hook recording 429 back-offs."""
+    if params.response.status == 429:
+        _note_rate_limit(params.url.host, params.response.headers.get("Retry-After"))
+
+
+@functools.lru_cache(maxsize=None)
+def sync_session() -> "requests.Session":
+    """Return the keep-alive requests session, creating it on first use.
+
+    Warm hosts skip DNS and TLS. raise_on_status=False hands the final 5xx
+    back to the caller so the features keep reporting their own status
+    errors. 429s are not retried and Retry-After is not slept on: a server
+    can ask for hours, which would block the call far past its timeout (and
+    retrying a daily-quota 429 burns quota); ttl_cache serves cached data
+    through the back-off instead.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[500, 502, 503, 504],
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": _USER_AGENT})
+    session.hooks["response"].append(_record_rate_limit)
+    return session
+
+
+# One pooled session per event loop; sessions cannot be shared across loops
+_session: Optional["aiohttp.ClientSession"] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_session() -> "aiohttp.ClientSession":
+    """Return the shared aiohttp session, creating it on first use."""
+    global _session, _session_loop
+    aiohttp = _aiohttp()
+    if aiohttp is None:
+        raise _AiohttpMissing("aiohttp is not installed")
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(_arecord_rate_limit)
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            headers={"User-Agent": _USER_AGENT},
+            trace_configs=[trace],
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared aiohttp session, if one is open."""
+    global _session, _session_loop
+    session, _session, _session_loop = _session, None, None
+    if session is not None and not session.closed:
+        await session.close()
+
+
+@atexit.register
+def _close_at_exit() -> None:
+    """Close a session left open on a still-usable loop at interpreter exit."""
+    if _session is not None and not _session.closed and _session_loop is not None:
+        if not _session_loop.is_closed() and not _session_loop.is_running():
+            _session_loop.run_until_complete(close_session())
+
+
+@functools.lru_cache(maxsize=None)
+def _disk_cache():
+    """Open the on-disk response cache, or None without diskcache."""
+    if diskcache is None:
+        return None
+    return diskcache.Cache(str(settings.data_dir / "httpcache"), size_limit=_DISK_CACHE_SIZE)
+
+
+def _cache_key(namespace: str, params: Dict[str, Any]) -> str:
+    """Hash a namespace and its call parameters into a cache key."""
+    payload = json.dumps([namespace, sorted(params.items())], default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[Tuple[float, Any]]:
+    """Return the (expires_at, value) entry for key, stale or not."""
+    with _memory_lock:
+        entry = _memory_cache.get(key)
+        if entry is not None:
+            _memory_cache.move_to_end(key)
+    if entry is None:
+        try:
+            disk = _disk_cache()
+            entry = disk.get(key) if disk is not None else None
+        except Exception as e:
+            # The disk layer is best-effort; a locked or corrupt database
+            # leaves the in-memory layer in charge
+            logger.warning("HTTP cache disk read failed", error=str(e))
+            entry = None
+        if entry is None:
+            return None
+        _memory_put(key, entry)
+    if entry[0] + _STALE_GRACE < time.time():
+        return None
+    return entry
+
+
+def _memory_put(key: str, entry: Tuple[float, Any]) -> None:
+    """Insert into the in-process LRU layer."""
+    with _memory_lock:
+        _memory_cache[key] = entry
+        _memory_cache.move_to_end(key)
+        if len(_memory_cache) > _MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def _cache_set(key: str, value: Any, ttl: float) -> None:
+    """Store a fresh value in memory and on disk.
+
+    The value is copied, so later changes by the caller don't reach the cache.
+    """
+    entry = (time.time() + ttl, copy.deepcopy(value))
+    _memory_put(key, entry)
+    try:
+        disk = _disk_cache()
+        if disk is not None:
+            disk.set(key, entry, expire=ttl + _STALE_GRACE)
+    except Exception as e:
+        logger.warning("HTTP cache disk write failed", error=str(e))
+
+
+def _is_error(result: Any) -> bool:
+    """Whether a feature result signals failure and must not be cached."""
+    return result is None or (isinstance(result, dict) and "error" in result)
+
+
+def _settle(key: str, entry: Optional[Tuple[float, Any]], result: Any, ttl: float) -> Any:
+    """Cache a good result, or fall back to (a copy of) the stale entry on failure."""
+    if not _is_error(result):
+        _cache_set(key, result, ttl)
+        return result
+    return copy.deepcopy(entry[1]) if entry is not None else result
+
+
+class ResponseCache:
+    """One namespace of the shared response cache, with a fixed TTL.
+
+    For callers that check and fill the cache themselves (HomeFeatures);
+    ``ttl_cache`` wraps whole functions. Keys may be any JSON-serializable
+    value, and readers get copies of the cached values.
+    """
+
+    def __init__(self, namespace: str, ttl: float):
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def get(self, key) -> Any:
+        """Return a copy of the cached value, or None if missing or expired."""
+        entry = _cache_get(_cache_key(self.namespace, {"key": key}))
+        if entry is None or entry[0] <= time.time():
+            return None
+        return copy.deepcopy(entry[1])
+
+    def set(self, key, value):
+        """Cache a value for the namespace's TTL."""
+        _cache_set(_cache_key(self.namespace, {"key": key}), value, self.ttl)
+
+
+def ttl_cache(ttl: float, namespace: str, url: str):
+    """Cache a feature's successful results for ttl seconds.
+
+    Entries are keyed by namespace and the bound call arguments (minus
+    ``self``), so a sync function and its async twin share one namespace.
+    Failed calls serve the expired entry when one exists, and while the
+    host of ``url`` is inside a 429 Retry-After window the network is not
+    tried at all if any cached entry is available. Callers get copies of
+    cached results.
+    """
+    host = urlsplit(url).hostname
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def lookup(args, kwargs) -> Tuple[str, Optional[Tuple[float, Any]], bool]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != "self"}
+            key = _cache_key(namespace, params)
+            entry = _cache_get(key)
+            now = time.time()
+            usable = entry is not None and (entry[0] > now or _retry_until.get(host, 0.0) > now)
+            return key, entry, usable
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key, entry, usable = lookup(args, kwargs)
+                if usable:
+                    return copy.deepcopy(entry[1])
+                return _settle(key, entry, await func(*args, **kwargs), ttl)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key, entry, usable = lookup(args, kwargs)
+            if usable:
+                return copy.deepcopy(entry[1])
+            return _settle(key, entry, func(*args, **kwargs), ttl)
+        return wrapper
+    return decorator
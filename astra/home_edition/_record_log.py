@@ -0,0 +1,261 @@
+"""
+Append-only NDJSON record store behind the Home Edition timers, reminders
+and notes.
+"""
+
+import atexit
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+    
+    def dumps(obj) -> bytes:
+        """Serialize a record to JSON bytes with orjson."""
+        return orjson.dumps(obj)
+    
+    loads = orjson.loads
+except ImportError:
+    import json
+    
+    def dumps(obj) -> bytes:
+        """Serialize a record to JSON bytes with the stdlib json module."""
+        return json.dumps(obj).encode()
+    
+    loads = json.loads
+
+# Superseded records tolerated before a log is compacted (it is also only
+# compacted once they outnumber the live ones)
+_LOG_COMPACT_MIN = 256
+
+
+def _is_record(record: Any) -> bool:
+    """Whether a decoded JSON value is a store record (a dict with an id)."""
+    return isinstance(record, dict) and "id" in record
+
+
+def _replay_log(path: Path, logger) -> List[Dict[str, Any]]:
+    """Read the records of an NDJSON log, skipping lines that don't parse.
+    
+    A bad final line is what a crash mid-append leaves behind; it is
+    truncated away so the next append starts on a line of its own.
+    """
+    records: List[Dict[str, Any]] = []
+    if not path.exists():
+        return records
+    with open(path, 'rb+') as f:
+        offset = 0
+        bad_start = None
+        ends_clean = True
+        for line in f:
+            start, offset = offset, offset + len(line)
+            ends_clean = line.endswith(b'\n')
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+                if not _is_record(record):
+                    raise ValueError("record has no id")
+            except ValueError:
+                if bad_start is not None:
+                    logger.warning("Skipping unreadable log line", path=str(path), offset=bad_start)
+                bad_start = start
+                continue
+            if bad_start is not None:
+                logger.warning("Skipping unreadable log line", path=str(path), offset=bad_start)
+                bad_start = None
+            records.append(record)
+        if bad_start is not None:
+            logger.warning("Truncating torn final log line", path=str(path), offset=bad_start)
+            f.truncate(bad_start)
+        elif not ends_clean:
+            # Last record is whole but lost its newline
+            f.write(b'\n')
+    return records
+
+
+# Stores with possibly unwritten puts, flushed once at interpreter exit
+_OPEN_STORES: "weakref.WeakSet[RecordLogStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores():
+    """Don't lose pending store writes at interpreter exit."""
+    for store in list(_OPEN_STORES):
+        store.flush()
+
+
+class RecordLogStore:
+    """Dict of JSON records kept in an append-only NDJSON log.
+    
+    Records are keyed by their ``id`` field. Readers get shallow copies, so
+    a change only reaches the store through ``put``. Puts are appended in batches
+    once writes go idle (or immediately with ``delay=None``), and the log
+    is rewritten only when superseded records outnumber live ones.
+    ``index_key`` maps a record to the values it should be found under;
+    ``lookup`` then returns matching records without scanning the store.
+    """
+    
+    def __init__(self, path: Path, logger, delay: Optional[float] = 0.5,
+                 index_key: Optional[Callable[[Dict[str, Any]], Iterable[str]]] = None):
+        self.path = path
+        self.logger = logger
+        self.delay = delay
+        self._records: Dict[str, Dict[str, Any]] = {}
+        # Keys put since the last flush, in put order
+        self._pending: Dict[str, None] = {}
+        self._log_records = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # Index value -> ids, as insertion-ordered dicts so lookups keep
+        # record order
+        self._index_key = index_key
+        self._index: Dict[str, Dict[str, None]] = {}
+        
+        for record in _replay_log(path, logger):
+            self._store(record)
+            self._log_records += 1
+        
+        _OPEN_STORES.add(self)
+    
+    def put(self, key: str, record: Dict[str, Any]):
+        """Store a record and schedule a write."""
+        with self._lock:
+            self._store(record)
+            self._pending[key] = None
+            if self.delay is not None:
+                # Restart the idle window so a burst of puts becomes one write
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if self.delay is None:
+            self.flush()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a record by key."""
+        record = self._records.get(key)
+        return None if record is None else dict(record)
+    
+    def values(self) -> List[Dict[str, Any]]:
+        """Return copies of all records."""
+        with self._lock:
+            return [dict(record) for record in self._records.values()]
+    
+    def lookup(self, value: str) -> List[Dict[str, Any]]:
+        """Return copies of the records indexed under a value."""
+        with self._lock:
+            return [dict(self._records[key]) for key in self._index.get(value, ())]
+    
+    def lookup_matching(self, match: Callable[[str], Any]) -> List[Dict[str, Any]]:
+        """Return copies of the records indexed under any value accepted by ``match``."""
+        with self._lock:
+            keys: Dict[str, None] = {}
+            for value, value_keys in self._index.items():
+                if value is not None and match(value):
+                    keys.update(value_keys)
+            return [dict(self._records[key]) for key in keys]
+    
+    def _store(self, record: Dict[str, Any]):
+        """Keep a record in memory, replacing any previous version."""
+        key = record["id"]
+        previous = self._records.get(key)
+        if previous is not None:
+            self._index_remove(key, previous)
+        self._records[key] = record
+        self._index_add(key, record)
+    
+    def _index_add(self, key: str, record: Dict[str, Any]):
+        """Add a record's index entries."""
+        if self._index_key is None:
+            return
+        for value in self._index_key(record):
+            self._index.setdefault(value, {})[key] = None
+    
+    def _index_remove(self, key: str, record: Dict[str, Any]):
+        """Drop a record's index entries."""
+        if self._index_key is None:
+            return
+        for value in self._index_key(record):
+            keys = self._index.get(value)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del self._index[value]
+    
+    def flush(self):
+        """Write pending changes to disk now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            
+            live = len(self._records)
+            stale = self._log_records + len(self._pending) - live
+            if stale > _LOG_COMPACT_MIN and stale > live:
+                # Rewrite the log with only the latest version of each record
+                tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+                with open(tmp_path, 'wb') as f:
+                    f.writelines(dumps(record) + b'\n' for record in self._records.values())
+                os.replace(tmp_path, self.path)
+                self._log_records = live
+            else:
+                with open(self.path, 'ab') as f:
+                    f.writelines(dumps(self._records[key]) + b'\n' for key in self._pending)
+                self._log_records += len(self._pending)
+            self._pending.clear()
+    
+    def import_snapshot(self, snapshot_path: Path):
+        """Fold a whole-store JSON snapshot (the previous format) into the log."""
+        if not snapshot_path.exists():
+            return
+        try:
+            with open(snapshot_path, 'rb') as f:
+                records = list(loads(f.read()).values())
+            if not all(_is_record(record) for record in records):
+                raise ValueError("snapshot has a record without an id")
+        except (OSError, ValueError, AttributeError) as e:
+            self._set_aside(snapshot_path, e)
+            return
+        with self._lock:
+            for record in records:
+                self._store(record)
+                self._pending[record["id"]] = None
+        self.flush()
+        snapshot_path.unlink()
+    
+    def import_legacy(self, files):
+        """Fold old one-record-per-file JSON files into the store."""
+        imported = []
+        for legacy_file in files:
+            try:
+                with open(legacy_file, 'rb') as f:
+                    record = loads(f.read())
+                if not _is_record(record):
+                    raise ValueError("record has no id")
+            except (OSError, ValueError) as e:
+                self._set_aside(legacy_file, e)
+                continue
+            with self._lock:
+                self._store(record)
+                self._pending[record["id"]] = None
+            imported.append(legacy_file)
+        if not imported:
+            return
+        self.flush()
+        for legacy_file in imported:
+            legacy_file.unlink()
+    
+    def _set_aside(self, path: Path, error: Exception):
+        """Log an unreadable import file and rename it to ``*.bad`` so it isn't retried."""
+        self.logger.error("Skipping unreadable store file", path=str(path), error=str(error))
+        try:
+            os.replace(path, path.with_name(path.name + ".bad"))
+        except OSError:
+            pass
@@ -8,11 +8,14 @@ and runtime integrity checks using only free tools and no exposed keys.
 import hashlib
 import os
 import platform
+import random
+import re
 import sys
 import time
 import inspect
+import mmap
 import threading
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Set, Tuple
 from pathlib import Path
 import psutil
 import ctypes
@@ -21,6 +24,54 @@ from datetime import datetime
 from astra.core.config import settings
 from astra.core.logging import get_logger
 
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+
+# Slice size for hashing files when hashlib.file_digest is unavailable
+_HASH_CHUNK_SIZE = 64 * 1024
+
+# Seconds between protection monitor scans, plus up to _MONITOR_JITTER extra
+_MONITOR_INTERVAL = 30.0
+_MONITOR_JITTER = 5.0
+
+# verify_feature_access trusts a clean scan this old (two monitor periods)
+_SCAN_MAX_AGE = 2 * (_MONITOR_INTERVAL + _MONITOR_JITTER)
+
+# Process names (lowercase) that indicate a debugger or VM guest tools
+_DEBUGGER_PROCESS_NAMES = frozenset({
+    'ollydbg.exe', 'x64dbg.exe', 'windbg.exe', 'ida.exe', 'ida64.exe',
+    'ghidra.exe', 'radare2.exe', 'gdb.exe', 'lldb.exe', 'xcode.exe',
+    'visualstudio.exe', 'devenv.exe', 'code.exe', 'pycharm.exe',
+})
+_VM_PROCESS_NAMES = frozenset({
+    'vmsrvc.exe', 'vmusrvc.exe', 'vmtoolsd.exe', 'vboxservice.exe',
+    'vboxtray.exe', 'vmwaretray.exe', 'vmwareuser.exe', 'vgauthservice.exe',
+})
+
+# Loaded-module path fragments that suggest injected code
+_INJECTION_PATTERN = re.compile(r'inject|hook|patch|cheat|hack|trainer', re.IGNORECASE)
+
+# Seconds between memory map walks in _detect_injection
+_INJECTION_CHECK_INTERVAL = 60.0
+
+# Registry keys probed for VM display adapters (Windows only)
+_VM_REGISTRY_KEYS = (
+    r"SYSTEM\CurrentControlSet\Control\DeviceClasses\{4d36e968-e325-11ce-bfc1-08002be10318}",
+    r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}",
+)
+
+# Debugger timing probe: SHA-256 rounds per probe, and how far over the
+# startup baseline (never less than the floor) counts as an anomaly
+_TIMING_PROBE_ROUNDS = 1000
+_TIMING_ANOMALY_FACTOR = 100
+_TIMING_ANOMALY_FLOOR_NS = 100_000_000
+
+# Seconds a process table scan is reused by the debugger and VM checks
+_PROCESS_SCAN_TTL = 2.0
+
 
 class HomeEditionProtection:
     """Code protection system for Home Edition - no licensing, pure protection."""
@@ -29,11 +80,31 @@ class HomeEditionProtection:
         self.logger = get_logger("astra.home.protection")
         self.integrity_checks = {}
         self.protection_active = False
+        # SHA-256 of sys.executable and the (mtime_ns, size) it was taken at
+        self._exe_hash: Optional[str] = None
+        self._exe_signature: Optional[Tuple[int, int]] = None
+        # Reference hash from integrity.hash, read once
+        self._stored_hash: Optional[str] = None
+        # Duration of the timing probe on this machine when undebugged
+        self._timing_baseline_ns = 0
+        # Monotonic time of the last security scan that found nothing
+        self._last_scan_time = float('-inf')
+        # Module name -> module object that last passed its integrity check
+        self._verified_modules: Dict[str, Any] = {}
+        # Module paths already checked by _detect_injection
+        self._seen_module_paths: Set[str] = set()
+        self._next_injection_check = 0.0
+        self._injection_detected = False
+        # (monotonic expiry, debugger running, VM tools running)
+        self._process_scan: Tuple[float, bool, bool] = (0.0, False, False)
         self._initialize_protection()
     
     def _initialize_protection(self):
         """Initialize all protection mechanisms."""
         try:
+            # Baseline for the debugger timing probe; best of a few runs
+            self._timing_baseline_ns = min(self._time_probe_ns() for _ in range(3))
+            
             # Start protection thread
             self.protection_active = True
             protection_thread = threading.Thread(target=self._protection_monitor, daemon=True)
@@ -62,20 +133,17 @@ class HomeEditionProtection:
         
         if self._detect_injection():
             self._terminate_app("Code injection detected")
+        
+        # Any failure above exits the process, so reaching here means clean
+        self._last_scan_time = time.monotonic()
     
     def _detect_debugger(self) -> bool:
         """Advanced debugger detection using multiple techniques."""
         try:
             # Check for common debugger processes
-            debugger_processes = [
-                'ollydbg.exe', 'x64dbg.exe', 'windbg.exe', 'ida.exe', 'ida64.exe',
-                'ghidra.exe', 'radare2.exe', 'gdb.exe', 'lldb.exe', 'xcode.exe',
-                'visualstudio.exe', 'devenv.exe', 'code.exe', 'pycharm.exe'
-            ]
-            
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'] and proc.info['name'].lower() in debugger_processes:
-                    return True
+            debugger_running, _ = self._scan_processes()
+            if debugger_running:
+                return True
             
             # Check for debugger flags in Windows
             if platform.system() == "Windows":
@@ -86,11 +154,13 @@ class HomeEditionProtection:
                 except:
                     pass
             
-            # Check for timing anomalies (debugger slows execution)
-            start_time = time.time()
-            time.sleep(0.001)  # 1ms sleep
-            elapsed = time.time() - start_time
-            if elapsed > 0.1:  # If sleep took more than 100ms, likely debugger
+            # Check for timing anomalies (single-stepping inflates a fixed
+            # CPU-bound probe by orders of magnitude over its startup baseline)
+            threshold = max(
+                self._timing_baseline_ns * _TIMING_ANOMALY_FACTOR,
+                _TIMING_ANOMALY_FLOOR_NS,
+            )
+            if self._time_probe_ns() > threshold:
                 return True
             
             # Check for breakpoint detection
@@ -101,6 +171,33 @@ class HomeEditionProtection:
         except Exception:
             return False
     
+    def _time_probe_ns(self) -> int:
+        """Time a small fixed CPU-bound workload in nanoseconds."""
+        start = time.perf_counter_ns()
+        for _ in range(_TIMING_PROBE_ROUNDS):
+            hashlib.sha256(b'astra').digest()
+        return time.perf_counter_ns() - start
+    
+    def _scan_processes(self) -> Tuple[bool, bool]:
+        """Return (debugger running, VM tools running) from one process table pass."""
+        now = time.monotonic()
+        expires_at, debugger_running, vm_tools_running = self._process_scan
+        if now < expires_at:
+            return debugger_running, vm_tools_running
+        
+        debugger_running = vm_tools_running = False
+        for proc in psutil.process_iter(['name']):
+            name = (proc.info['name'] or '').lower()
+            if name in _DEBUGGER_PROCESS_NAMES:
+                debugger_running = True
+            elif name in _VM_PROCESS_NAMES:
+                vm_tools_running = True
+            if debugger_running and vm_tools_running:
+                break
+        
+        self._process_scan = (now + _PROCESS_SCAN_TTL, debugger_running, vm_tools_running)
+        return debugger_running, vm_tools_running
+    
     def _check_breakpoints(self) -> bool:
         """Detect software breakpoints by checking for INT3 instructions."""
         try:
@@ -118,24 +215,14 @@ class HomeEditionProtection:
         """Detect if running in virtualized environment."""
         try:
             # Check for common VM processes
-            vm_processes = [
-                'vmsrvc.exe', 'vmusrvc.exe', 'vmtoolsd.exe', 'vboxservice.exe',
-                'vboxtray.exe', 'vmwaretray.exe', 'vmwareuser.exe', 'VGAuthService.exe'
-            ]
-            
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'] and proc.info['name'].lower() in vm_processes:
-                    return True
+            _, vm_tools_running = self._scan_processes()
+            if vm_tools_running:
+                return True
             
             # Check for VM-specific registry keys (Windows)
-            if platform.system() == "Windows":
+            if winreg is not None:
                 try:
-                    import winreg
-                    vm_keys = [
-                        r"SYSTEM\CurrentControlSet\Control\DeviceClasses\{4d36e968-e325-11ce-bfc1-08002be10318}",
-                        r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}"
-                    ]
-                    for key_path in vm_keys:
+                    for key_path in _VM_REGISTRY_KEYS:
                         try:
                             winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path)
                         except:
@@ -152,42 +239,54 @@ class HomeEditionProtection:
         try:
             # Check main executable integrity
             main_file = Path(sys.executable)
-            if main_file.exists():
-                current_hash = self._calculate_file_hash(main_file)
-                # Store hash on first run, compare on subsequent runs
+            try:
+                stat = main_file.stat()
+            except FileNotFoundError:
+                return False
+            
+            # Only re-hash when the file on disk has actually changed
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature != self._exe_signature:
+                self._exe_hash = self._calculate_file_hash(main_file)
+                self._exe_signature = signature
+            current_hash = self._exe_hash
+            
+            # Store hash on first run, compare on subsequent runs
+            if self._stored_hash is None:
                 hash_file = settings.data_dir / "integrity.hash"
-                
                 if hash_file.exists():
                     with open(hash_file, 'r') as f:
-                        stored_hash = f.read().strip()
-                    if current_hash != stored_hash:
-                        return True
+                        self._stored_hash = f.read().strip()
                 else:
                     with open(hash_file, 'w') as f:
                         f.write(current_hash)
+                    self._stored_hash = current_hash
             
-            return False
+            return current_hash != self._stored_hash
         except Exception:
             return False
     
     def _detect_injection(self) -> bool:
         """Detect DLL injection and code injection attempts."""
         try:
-            # Check for suspicious loaded modules
-            current_process = psutil.Process()
-            loaded_modules = current_process.memory_maps()
+            # Walking the memory maps is expensive; do it on its own slower clock
+            now = time.monotonic()
+            if now < self._next_injection_check:
+                return self._injection_detected
+            self._next_injection_check = now + _INJECTION_CHECK_INTERVAL
             
-            suspicious_patterns = [
-                'inject', 'hook', 'patch', 'cheat', 'hack', 'trainer'
-            ]
+            # Check for suspicious loaded modules, looking only at paths not
+            # already vetted on an earlier pass
+            module_paths = {module.path for module in psutil.Process().memory_maps()}
+            new_paths = module_paths - self._seen_module_paths
+            self._seen_module_paths |= new_paths
             
-            for module in loaded_modules:
-                module_path = module.path.lower()
-                for pattern in suspicious_patterns:
-                    if pattern in module_path:
-                        return True
+            for module_path in new_paths:
+                if _INJECTION_PATTERN.search(module_path):
+                    self._injection_detected = True
+                    break
             
-            return False
+            return self._injection_detected
         except Exception:
             return False
     
@@ -195,7 +294,20 @@ class HomeEditionProtection:
         """Calculate SHA-256 hash of file."""
         try:
             with open(file_path, 'rb') as f:
-                return hashlib.sha256(f.read()).hexdigest()
+                if hasattr(hashlib, 'file_digest'):
+                    return hashlib.file_digest(f, 'sha256').hexdigest()
+                # Python < 3.11: hash an mmap view in cache-sized slices
+                # instead of copying the file into memory
+                digest = hashlib.sha256()
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        view = memoryview(mm)
+                        try:
+                            for offset in range(0, len(mm), _HASH_CHUNK_SIZE):
+                                digest.update(view[offset:offset + _HASH_CHUNK_SIZE])
+                        finally:
+                            view.release()
+                return digest.hexdigest()
         except Exception:
             return ""
     
@@ -210,42 +322,38 @@ class HomeEditionProtection:
     
     def _check_config_integrity(self) -> bool:
         """Check configuration module integrity."""
-        try:
-            config_module = sys.modules.get('astra.core.config')
-            if config_module:
-                # Check if critical settings are intact
-                required_attrs = ['settings', 'data_dir', 'app_version']
-                for attr in required_attrs:
-                    if not hasattr(config_module, attr):
-                        return False
-            return True
-        except Exception:
-            return False
+        # Check if critical settings are intact
+        return self._check_module_integrity(
+            'astra.core.config', ('settings', 'data_dir', 'app_version')
+        )
     
     def _check_security_integrity(self) -> bool:
         """Check security module integrity."""
-        try:
-            security_module = sys.modules.get('astra.core.security')
-            if security_module:
-                # Check if security functions are intact
-                required_funcs = ['encrypt_data', 'decrypt_data', 'hash_password']
-                for func in required_funcs:
-                    if not hasattr(security_module, func):
-                        return False
-            return True
-        except Exception:
-            return False
+        # Check if security functions are intact
+        return self._check_module_integrity(
+            'astra.core.security', ('encrypt_data', 'decrypt_data', 'hash_password')
+        )
     
     def _check_database_integrity(self) -> bool:
         """Check database module integrity."""
+        # Check if database functions are intact
+        return self._check_module_integrity(
+            'astra.core.database', ('get_database', 'init_database')
+        )
+    
+    def _check_module_integrity(self, module_name: str, required_attrs: Tuple[str, ...]) -> bool:
+        """Check a loaded module exposes the required attributes."""
         try:
-            db_module = sys.modules.get('astra.core.database')
-            if db_module:
-                # Check if database functions are intact
-                required_funcs = ['get_database', 'init_database']
-                for func in required_funcs:
-                    if not hasattr(db_module, func):
-                        return False
+            module = sys.modules.get(module_name)
+            if module is None:
+                return True
+            # A module object that passed once is trusted until it is replaced
+            if self._verified_modules.get(module_name) is module:
+                return True
+            for attr in required_attrs:
+                if not hasattr(module, attr):
+                    return False
+            self._verified_modules[module_name] = module
             return True
         except Exception:
             return False
@@ -263,8 +371,8 @@ class HomeEditionProtection:
                         if not check_func():
                             self._terminate_app(f"Integrity check failed: {module}.{check_name}")
                 
-                # Sleep for a short interval
-                time.sleep(5)  # Check every 5 seconds
+                # Jitter keeps the scan from being trivially predictable
+                time.sleep(_MONITOR_INTERVAL + random.uniform(0, _MONITOR_JITTER))
                 
             except Exception as e:
                 self.logger.error(f"Protection monitor error: {e}")
@@ -293,8 +401,10 @@ class HomeEditionProtection:
     def verify_feature_access(self, feature_name: str) -> bool:
         """Verify access to a specific feature (always True for Home Edition)."""
         # For Home Edition, all features are available
-        # But we still run security checks
-        self._security_scan()
+        # But we still run security checks, reusing the monitor's last clean
+        # scan while it is fresh
+        if time.monotonic() - self._last_scan_time > _SCAN_MAX_AGE:
+            self._security_scan()
         return True
     
     def get_protection_status(self) -> Dict[str, Any]:
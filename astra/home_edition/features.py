@@ -5,22 +5,240 @@ All the personal productivity tools and day-to-day life features for Home Editio
 No mock code, only real implementations and real API integrations.
 """
 
+import ast
 import asyncio
-import json
+import base64
+import concurrent.futures
+import fnmatch
+import functools
+import itertools
 import math
 import re
+import shutil
+import threading
+import time
+import types
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Awaitable, Callable, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
-import platform
-import requests
 import os
 
 from astra.core.config import settings
 from astra.core.logging import get_logger
 from astra.core.security import security_manager
+from . import _http
+from ._calc import check_power, check_repetition
+from ._record_log import RecordLogStore, loads as _loads
 from .drm import verify_feature_access
 
+# HTTP clients are imported on first use (_import_requests / _import_aiohttp)
+# so creating HomeFeatures doesn't pay for them
+requests = None
+aiohttp = None
+
+
+def _import_requests():
+    """Import requests on first use."""
+    global requests
+    if requests is None:
+        import requests as module
+        requests = module
+    return requests
+
+
+def _import_aiohttp():
+    """Import aiohttp on first use."""
+    global aiohttp
+    if aiohttp is None:
+        import aiohttp as module
+        aiohttp = module
+    return aiohttp
+
+
+try:
+    import psutil
+    # The first interval=None sample only starts the measurement window
+    psutil.cpu_percent(interval=None)
+except ImportError:
+    psutil = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+
+# str.translate table deleting every ASCII character calculator input may
+# not contain (non-ASCII is dropped before translating)
+_CALC_ALLOWED = "0123456789+-*/()., "
+_CALC_DELETE = {c: None for c in range(128) if chr(c) not in _CALC_ALLOWED}
+
+# AST nodes a calculator expression may contain: numbers, arithmetic operators,
+# parentheses and comma-separated tuples
+_SAFE_NODES = frozenset({
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Tuple, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.USub, ast.UAdd,
+})
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_expression(expression: str) -> types.CodeType:
+    """Parse, whitelist-check and compile a calculator expression once."""
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        if type(node) not in _SAFE_NODES:
+            raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            check_power(node)
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+            check_repetition(node)
+    return compile(tree, "<calculator>", "eval")
+
+
+# Characters that make a tag filter a glob pattern rather than a literal tag
+_GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> "re.Pattern[str]":
+    """Translate a tag glob such as ``work/*`` to a regex once."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+# Functions offered by scientific_calculator
+_SCI_FUNCS: Dict[str, Callable[[float], float]] = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "log": math.log10,
+    "ln": math.log,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "abs": abs,
+}
+
+
+# Note bodies longer than this (in characters) are stored LZ4-compressed
+_NOTE_COMPRESS_MIN = 1024
+
+# How long a get_system_info() snapshot is served before resampling
+_SYSTEM_INFO_TTL = 1.0
+
+
+@functools.lru_cache(maxsize=None)
+def _boot_time() -> datetime:
+    """Return the system boot time, which can't change while we run."""
+    return datetime.fromtimestamp(psutil.boot_time())
+
+
+@functools.lru_cache(maxsize=None)
+def _platform_info() -> Dict[str, str]:
+    """Return the static platform fields of get_system_info."""
+    import platform
+    
+    return {
+        "platform": platform.system(),
+        "platform_version": platform.version(),
+        "python_version": platform.python_version(),
+        "architecture": platform.architecture()[0]
+    }
+
+# Outbound async API requests allowed in flight at once
+_AIO_MAX_IN_FLIGHT = 16
+
+# How long a granted feature access check is reused
+_FEATURE_ACCESS_TTL = 60.0
+
+# Query params carrying API keys; kept out of cache keys written to disk
+_CREDENTIAL_PARAMS = frozenset({"key", "access_key", "apiKey", "apikey", "api_key"})
+
+# OCR.Space endpoint and the form fields sent with every upload
+_OCR_URL = 'https://api.ocr.space/parse/image'
+_OCR_FORM = {
+    'language': 'eng',
+    'isOverlayRequired': False,
+    'filetype': 'png',
+    'detectOrientation': True
+}
+
+
+def _pack_note(note: Dict[str, Any]) -> Dict[str, Any]:
+    """Swap a long note body for its LZ4-compressed, base64 form."""
+    content = note["content"]
+    if lz4 is None or len(content) <= _NOTE_COMPRESS_MIN:
+        return note
+    packed = base64.b64encode(lz4.frame.compress(content.encode())).decode()
+    if len(packed) >= len(content):
+        return note
+    return dict(note, content=None, content_lz4=packed)
+
+
+def _unpack_note(note: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a note with its body decompressed if it was packed."""
+    packed = note.get("content_lz4")
+    if packed is None:
+        return note
+    if lz4 is None:
+        raise RuntimeError("lz4 library not installed - run 'pip install lz4'")
+    content = lz4.frame.decompress(base64.b64decode(packed)).decode()
+    unpacked = dict(note, content=content)
+    del unpacked["content_lz4"]
+    return unpacked
+
+
+def _requires(feature_name: str, label: str):
+    """Gate a HomeFeatures method (sync or async) on access to a feature."""
+    denied = {"error": f"{label} feature not available"}
+    
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                if not self._check_feature_access(feature_name):
+                    return dict(denied)
+                return await func(self, *args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                if not self._check_feature_access(feature_name):
+                    return dict(denied)
+                return func(self, *args, **kwargs)
+        return wrapper
+    
+    return decorator
+
+
+@dataclass(frozen=True, slots=True)
+class _ApiRequest:
+    """An external API call shared by the sync and async code paths."""
+    method: str
+    url: str
+    timeout: float
+    # Names used in timeout/connection and catch-all error messages
+    api_name: str
+    error_name: str
+    # (HTTP status, response body) -> result dict
+    parse: Callable[[int, str], Dict[str, Any]]
+    params: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+    # Revalidate with If-None-Match / If-Modified-Since when the API sends
+    # ETag / Last-Modified
+    conditional: bool = False
+    
+    def flight_key(self) -> Tuple[Any, ...]:
+        """Identify identical requests in flight."""
+        return (self.method, self.url, tuple(sorted((self.params or {}).items())))
+    
+    def cache_key(self) -> Tuple[Any, ...]:
+        """flight_key without credential params, stable across runs and safe to persist."""
+        return (self.method, self.url, tuple(sorted(
+            (name, value) for name, value in (self.params or {}).items()
+            if name not in _CREDENTIAL_PARAMS
+        )))
+
 
 class HomeFeatures:
     """Home Edition feature implementations (real code only)."""
@@ -30,23 +248,93 @@ class HomeFeatures:
         self.data_dir = settings.data_dir / "home_features"
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
+        # Record ids come from one counter seeded with the current time in
+        # microseconds, so they stay unique within a process and across restarts
+        self._id_counter = itertools.count(time.time_ns() // 1000)
+        
+        # Timers live in one append-only NDJSON log, with the latest record
+        # per timer kept in memory so polls never touch disk; each change is
+        # written through rather than batched
+        self._timers = RecordLogStore(self.data_dir / "timers.log", self.logger, delay=None)
+        self._timers.import_legacy(self.data_dir.glob("timer_*.json"))
+        
+        # Reminders and notes are held in memory, written out in batches and
+        # indexed by status / tag so queries only touch matching records
+        self._reminders = RecordLogStore(
+            self.data_dir / "reminders.log",
+            self.logger,
+            index_key=lambda reminder: (reminder.get("status"),),
+        )
+        self._reminders.import_snapshot(self.data_dir / "reminders.json")
+        self._reminders.import_legacy(self.data_dir.glob("reminder_*.json"))
+        self._notes = RecordLogStore(
+            self.data_dir / "notes.log",
+            self.logger,
+            index_key=lambda note: note.get("tags", ()),
+        )
+        self._notes.import_snapshot(self.data_dir / "notes.json")
+        self._notes.import_legacy(self.data_dir.glob("note_*.json"))
+        
+        # HTTP sessions and the response cache are the shared ones in _http.
+        # The semaphore capping async requests in flight is created on the
+        # first async API call and rebuilt when a later asyncio.run() brings
+        # a new loop
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._aio_limit: Optional[asyncio.Semaphore] = None
+        
+        # Requests currently on the wire, so identical concurrent calls
+        # wait for the first one instead of sending their own
+        self._inflight: Dict[Tuple[Any, ...], concurrent.futures.Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._aio_inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        
+        # API response caches; FX caches the rate so any amount can hit.
+        # TTLs are matched to how fast the data changes
+        self._weather_cache = _http.ResponseCache("weather", ttl=600)
+        self._fx_cache = _http.ResponseCache("fx", ttl=3600)
+        self._search_cache = _http.ResponseCache("web_search", ttl=300)
+        self._dict_cache = _http.ResponseCache("dict", ttl=30 * 86400)
+        # (ETag, Last-Modified, body) of conditional requests, kept well past
+        # the result TTLs so expired entries can be revalidated with a 304
+        self._validators = _http.ResponseCache("validators", ttl=7 * 86400)
+        # The previous, separate disk cache; its validator keys held API keys
+        shutil.rmtree(self.data_dir / "api_cache", ignore_errors=True)
+        
+        # Last system info snapshot and when it was taken
+        self._sys_info_cached: Optional[Dict[str, Any]] = None
+        self._sys_info_ts = float("-inf")
+        
+        # feature name -> monotonic time its access grant expires
+        self._access_cache: Dict[str, float] = {}
+        
     def _check_feature_access(self, feature_name: str) -> bool:
         """Check if user has access to specific feature."""
-        return verify_feature_access(feature_name)
+        now = time.monotonic()
+        if self._access_cache.get(feature_name, 0.0) > now:
+            return True
+        # Only grants are cached, so a denial is re-checked on the next call
+        granted = verify_feature_access(feature_name)
+        if granted:
+            self._access_cache[feature_name] = now + _FEATURE_ACCESS_TTL
+        return granted
+    
+    def invalidate_feature_access(self):
+        """Drop cached access grants, e.g. after a license change."""
+        self._access_cache.clear()
     
     # ==================== CALCULATOR ====================
     
+    @_requires("calculator", "Calculator")
     def calculator(self, expression: str) -> Dict[str, Any]:
         """Basic calculator with scientific functions."""
-        if not self._check_feature_access("calculator"):
-            return {"error": "Calculator feature not available"}
-        
         try:
             # Sanitize input - only allow safe mathematical operations
-            expression = re.sub(r'[^0-9+\-*/()., ]', '', expression)
+            if not expression.isascii():
+                expression = expression.encode("ascii", "ignore").decode()
+            expression = expression.translate(_CALC_DELETE)
             
             # Handle basic operations
-            result = eval(expression)
+            result = eval(_compile_expression(expression), {"__builtins__": {}})
             
             return {
                 "expression": expression,
@@ -56,29 +344,17 @@ class HomeFeatures:
         except Exception as e:
             return {"error": f"Calculation error: {str(e)}"}
     
+    @_requires("calculator", "Calculator")
     def scientific_calculator(self, function: str, value: float) -> Dict[str, Any]:
         """Scientific calculator functions."""
-        if not self._check_feature_access("calculator"):
-            return {"error": "Calculator feature not available"}
-        
         try:
-            import math
-            
-            functions = {
-                "sin": math.sin,
-                "cos": math.cos,
-                "tan": math.tan,
-                "log": math.log10,
-                "ln": math.log,
-                "sqrt": math.sqrt,
-                "exp": math.exp,
-                "abs": abs,
-            }
-            
-            if function not in functions:
+            fn = _SCI_FUNCS.get(function)
+            if fn is None:
                 return {"error": f"Unknown function: {function}"}
+            if not math.isfinite(value):
+                return {"error": "Value must be a finite number"}
             
-            result = functions[function](value)
+            result = fn(value)
             
             return {
                 "function": function,
@@ -91,28 +367,27 @@ class HomeFeatures:
     
     # ==================== TIMER ====================
     
+    @_requires("timer", "Timer")
     def start_timer(self, duration_seconds: int, name: str = "Timer") -> Dict[str, Any]:
         """Start a timer."""
-        if not self._check_feature_access("timer"):
-            return {"error": "Timer feature not available"}
-        
         try:
-            timer_id = f"timer_{datetime.now().timestamp()}"
-            end_time = datetime.now() + timedelta(seconds=duration_seconds)
+            now = datetime.now()
+            timer_id = f"timer_{next(self._id_counter):x}"
+            end_time = now + timedelta(seconds=duration_seconds)
             
             timer_data = {
                 "id": timer_id,
                 "name": name,
                 "duration": duration_seconds,
-                "start_time": datetime.now().isoformat(),
+                "start_time": now.isoformat(),
                 "end_time": end_time.isoformat(),
+                # Epoch copy of end_time so polls skip the ISO parse
+                "end_ts": end_time.timestamp(),
                 "status": "running"
             }
             
             # Save timer
-            timer_file = self.data_dir / f"{timer_id}.json"
-            with open(timer_file, 'w') as f:
-                json.dump(timer_data, f)
+            self._timers.put(timer_id, timer_data)
             
             return {
                 "timer_id": timer_id,
@@ -124,26 +399,23 @@ class HomeFeatures:
         except Exception as e:
             return {"error": f"Timer error: {str(e)}"}
     
+    @_requires("timer", "Timer")
     def check_timer(self, timer_id: str) -> Dict[str, Any]:
         """Check timer status."""
-        if not self._check_feature_access("timer"):
-            return {"error": "Timer feature not available"}
-        
         try:
-            timer_file = self.data_dir / f"{timer_id}.json"
-            if not timer_file.exists():
+            timer_data = self._timers.get(timer_id)
+            if timer_data is None:
                 return {"error": "Timer not found"}
-            
-            with open(timer_file, 'r') as f:
-                timer_data = json.load(f)
-            
-            end_time = datetime.fromisoformat(timer_data["end_time"])
-            remaining = (end_time - datetime.now()).total_seconds()
+            end_ts = timer_data.get("end_ts")
+            if end_ts is None:
+                # Timers logged before end_ts was stored
+                end_ts = datetime.fromisoformat(timer_data["end_time"]).timestamp()
+            remaining = end_ts - time.time()
             
             if remaining <= 0:
-                timer_data["status"] = "completed"
-                with open(timer_file, 'w') as f:
-                    json.dump(timer_data, f)
+                if timer_data["status"] != "completed":
+                    timer_data["status"] = "completed"
+                    self._timers.put(timer_id, timer_data)
                 
                 return {
                     "timer_id": timer_id,
@@ -163,14 +435,13 @@ class HomeFeatures:
     
     # ==================== REMINDER ====================
     
+    @_requires("reminder", "Reminder")
     def create_reminder(self, title: str, message: str, due_time: str, 
                        priority: str = "medium") -> Dict[str, Any]:
         """Create a reminder."""
-        if not self._check_feature_access("reminder"):
-            return {"error": "Reminder feature not available"}
-        
         try:
-            reminder_id = f"reminder_{datetime.now().timestamp()}"
+            now = datetime.now()
+            reminder_id = f"reminder_{next(self._id_counter):x}"
             due_datetime = datetime.fromisoformat(due_time)
             
             reminder_data = {
@@ -178,15 +449,14 @@ class HomeFeatures:
                 "title": title,
                 "message": message,
                 "due_time": due_time,
+                "due_ts": due_datetime.timestamp(),
                 "priority": priority,
-                "created_at": datetime.now().isoformat(),
+                "created_at": now.isoformat(),
                 "status": "pending"
             }
             
             # Save reminder
-            reminder_file = self.data_dir / f"{reminder_id}.json"
-            with open(reminder_file, 'w') as f:
-                json.dump(reminder_data, f)
+            self._reminders.put(reminder_id, reminder_data)
             
             return {
                 "reminder_id": reminder_id,
@@ -197,19 +467,11 @@ class HomeFeatures:
         except Exception as e:
             return {"error": f"Reminder error: {str(e)}"}
     
+    @_requires("reminder", "Reminder")
     def get_reminders(self, status: str = "pending") -> Dict[str, Any]:
         """Get all reminders."""
-        if not self._check_feature_access("reminder"):
-            return {"error": "Reminder feature not available"}
-        
         try:
-            reminders = []
-            for file in self.data_dir.glob("reminder_*.json"):
-                with open(file, 'r') as f:
-                    reminder_data = json.load(f)
-                
-                if reminder_data.get("status") == status:
-                    reminders.append(reminder_data)
+            reminders = self._reminders.lookup(status)
             
             return {
                 "reminders": reminders,
@@ -220,27 +482,25 @@ class HomeFeatures:
     
     # ==================== NOTES ====================
     
+    @_requires("notes", "Notes")
     def create_note(self, title: str, content: str, tags: Optional[List[str]] = None) -> Dict[str, Any]:
         """Create a note."""
-        if not self._check_feature_access("notes"):
-            return {"error": "Notes feature not available"}
-        
         try:
-            note_id = f"note_{datetime.now().timestamp()}"
+            now = datetime.now()
+            note_id = f"note_{next(self._id_counter):x}"
+            created_at = now.isoformat()
             
             note_data = {
                 "id": note_id,
                 "title": title,
                 "content": content,
-                "tags": tags or [],
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
+                "tags": list(tags) if tags else [],
+                "created_at": created_at,
+                "updated_at": created_at
             }
             
-            # Save note
-            note_file = self.data_dir / f"{note_id}.json"
-            with open(note_file, 'w') as f:
-                json.dump(note_data, f)
+            # Save note, compressing long bodies
+            self._notes.put(note_id, _pack_note(note_data))
             
             return {
                 "note_id": note_id,
@@ -250,19 +510,18 @@ class HomeFeatures:
         except Exception as e:
             return {"error": f"Note error: {str(e)}"}
     
+    @_requires("notes", "Notes")
     def get_notes(self, tag: Optional[str] = None) -> Dict[str, Any]:
-        """Get all notes."""
-        if not self._check_feature_access("notes"):
-            return {"error": "Notes feature not available"}
-        
+        """Get all notes, optionally filtered by a tag or tag glob (e.g. ``work/*``)."""
         try:
-            notes = []
-            for file in self.data_dir.glob("note_*.json"):
-                with open(file, 'r') as f:
-                    note_data = json.load(f)
-                
-                if tag is None or tag in note_data.get("tags", []):
-                    notes.append(note_data)
+            if tag is None:
+                notes = self._notes.values()
+            elif _GLOB_CHARS.search(tag):
+                # Match the pattern against distinct tags, not every note
+                notes = self._notes.lookup_matching(_compile_glob(tag).fullmatch)
+            else:
+                notes = self._notes.lookup(tag)
+            notes = [_unpack_note(note) for note in notes]
             
             return {
                 "notes": notes,
@@ -271,269 +530,552 @@ class HomeFeatures:
         except Exception as e:
             return {"error": f"Get notes error: {str(e)}"}
     
+    # ==================== API PLUMBING ====================
+    
+    def _call_api(self, request: "_ApiRequest") -> Dict[str, Any]:
+        """Send a prepared API request, sharing the response of an identical one in flight."""
+        key = request.flight_key()
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = concurrent.futures.Future()
+        if not leader:
+            return dict(future.result())
+        
+        try:
+            result = self._send_api(request)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        future.set_result(result)
+        return result
+    
+    def _get_http(self) -> "requests.Session":
+        """Return the shared pooled requests session."""
+        _import_requests()
+        return _http.sync_session()
+    
+    def _send_api(self, request: "_ApiRequest") -> Dict[str, Any]:
+        """Send a prepared API request over the pooled requests session."""
+        # Outside the try so the except clauses below can name requests
+        http = self._get_http()
+        try:
+            headers, validator = self._conditional_headers(request)
+            resp = http.request(
+                request.method,
+                request.url,
+                params=request.params,
+                headers=headers,
+                timeout=request.timeout,
+            )
+            status, body = self._revalidate(request, validator, resp.status_code, resp.text, resp.headers)
+            return request.parse(status, body)
+        except requests.exceptions.Timeout:
+            return {"error": f"{request.api_name} API request timed out"}
+        except requests.exceptions.RequestException as e:
+            return {"error": f"{request.api_name} API connection error: {str(e)}"}
+        except Exception as e:
+            return {"error": f"{request.error_name} error: {str(e)}"}
+    
+    def _conditional_headers(self, request: "_ApiRequest") -> Tuple[Optional[Dict[str, str]], Optional[Tuple[Any, ...]]]:
+        """Return the headers to send and the stored validator, if any."""
+        if not request.conditional:
+            return request.headers, None
+        validator = self._validators.get(request.cache_key())
+        if validator is None:
+            return request.headers, None
+        etag, last_modified, _ = validator
+        headers = dict(request.headers or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers, validator
+    
+    def _revalidate(self, request: "_ApiRequest", validator: Optional[Tuple[Any, ...]],
+                    status: int, body: str, resp_headers) -> Tuple[int, str]:
+        """Swap a 304 for the stored body; remember validators of fresh 200s."""
+        if not request.conditional:
+            return status, body
+        if status == 304 and validator is not None:
+            return 200, validator[2]
+        if status == 200:
+            etag = resp_headers.get("ETag")
+            last_modified = resp_headers.get("Last-Modified")
+            if etag or last_modified:
+                self._validators.set(request.cache_key(), (etag, last_modified, body))
+        return status, body
+    
+    def _bind_event_loop(self):
+        """Drop async state that belongs to an event loop other than the running one."""
+        loop = asyncio.get_running_loop()
+        if self._aio_loop is not loop:
+            self._aio_loop = loop
+            self._aio_limit = None
+            self._aio_inflight = {}
+    
+    async def _get_aio_session(self) -> "aiohttp.ClientSession":
+        """Return the shared aiohttp session for the running loop."""
+        self._bind_event_loop()
+        _import_aiohttp()
+        if self._aio_limit is None:
+            self._aio_limit = asyncio.Semaphore(_AIO_MAX_IN_FLIGHT)
+        return _http.get_session()
+    
+    async def _acall_api(self, request: "_ApiRequest") -> Dict[str, Any]:
+        """Async variant of _call_api."""
+        self._bind_event_loop()
+        key = request.flight_key()
+        future = self._aio_inflight.get(key)
+        if future is not None:
+            try:
+                # shield: cancelling this waiter must not cancel the leader
+                return dict(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled; send the request ourselves
+        
+        future = self._aio_inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._asend_api(request)
+        except BaseException:
+            # Waiters see the cancellation and retry on their own
+            future.cancel()
+            raise
+        finally:
+            if self._aio_inflight.get(key) is future:
+                del self._aio_inflight[key]
+        future.set_result(result)
+        return result
+    
+    async def _asend_api(self, request: "_ApiRequest") -> Dict[str, Any]:
+        """Send a prepared API request over the shared aiohttp session."""
+        # Outside the try so the except clauses below can name aiohttp
+        session = await self._get_aio_session()
+        try:
+            # aiohttp only accepts str/int/float query values
+            params = {
+                key: str(value) if isinstance(value, bool) else value
+                for key, value in (request.params or {}).items()
+            }
+            headers, validator = self._conditional_headers(request)
+            async with self._aio_limit, session.request(
+                request.method,
+                request.url,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=request.timeout),
+            ) as resp:
+                status, body = self._revalidate(request, validator, resp.status, await resp.text(), resp.headers)
+                return request.parse(status, body)
+        except asyncio.TimeoutError:
+            return {"error": f"{request.api_name} API request timed out"}
+        except aiohttp.ClientError as e:
+            return {"error": f"{request.api_name} API connection error: {str(e)}"}
+        except Exception as e:
+            return {"error": f"{request.error_name} error: {str(e)}"}
+    
+    async def abatch(self, *calls: Awaitable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run several async feature calls (e.g. aget_weather(...)) concurrently."""
+        return list(await asyncio.gather(*calls))
+    
+    async def aclose(self):
+        """Close the shared aiohttp session."""
+        await _http.close_session()
+    
     # ==================== WEATHER (REAL API) ====================
     
+    @_requires("weather", "Weather")
     def get_weather(self, location: str) -> Dict[str, Any]:
         """Get weather information using WeatherAPI (free tier: 1M calls/month)."""
-        if not self._check_feature_access("weather"):
-            return {"error": "Weather feature not available"}
+        result, request = self._prepare_weather(location)
+        return result if request is None else self._call_api(request)
+    
+    @_requires("weather", "Weather")
+    async def aget_weather(self, location: str) -> Dict[str, Any]:
+        """Async variant of get_weather."""
+        result, request = self._prepare_weather(location)
+        return result if request is None else await self._acall_api(request)
+    
+    def _prepare_weather(self, location: str) -> Tuple[Optional[Dict[str, Any]], Optional["_ApiRequest"]]:
+        """Return (result, None) when no call is needed, else (None, request)."""
+        # WeatherAPI requires an API key - get from settings or environment
+        api_key = settings.openweather_api_key or os.getenv("WEATHERAPI_KEY")
+        if not api_key:
+            return {
+                "error": "Weather API key not configured",
+                "setup_required": "Get free API key from https://www.weatherapi.com/",
+                "free_tier": "1 million calls/month"
+            }, None
         
-        try:
-            # WeatherAPI requires an API key - get from settings or environment
-            api_key = settings.openweather_api_key or os.getenv("WEATHERAPI_KEY")
-            if not api_key:
-                return {
-                    "error": "Weather API key not configured", 
-                    "setup_required": "Get free API key from https://www.weatherapi.com/",
-                    "free_tier": "1 million calls/month"
-                }
-            
-            url = f"https://api.weatherapi.com/v1/current.json"
-            params = {
+        cache_key = location.lower()
+        cached = self._weather_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached), None
+        
+        return None, _ApiRequest(
+            method="GET",
+            url="https://api.weatherapi.com/v1/current.json",
+            params={
                 "key": api_key,
                 "q": location,
                 "aqi": "no"  # Don't include air quality to save API calls
+            },
+            timeout=10,
+            api_name="Weather",
+            error_name="Weather",
+            parse=functools.partial(self._parse_weather, cache_key),
+            conditional=True,
+        )
+    
+    def _parse_weather(self, cache_key: str, status: int, body: str) -> Dict[str, Any]:
+        """Turn a WeatherAPI response into a result dict."""
+        if status == 200:
+            data = _loads(body)
+            result = {
+                "location": data["location"]["name"],
+                "region": data["location"]["region"],
+                "country": data["location"]["country"],
+                "temperature_c": data["current"]["temp_c"],
+                "temperature_f": data["current"]["temp_f"],
+                "condition": data["current"]["condition"]["text"],
+                "humidity": data["current"]["humidity"],
+                "wind_kph": data["current"]["wind_kph"],
+                "wind_mph": data["current"]["wind_mph"],
+                "icon": data["current"]["condition"]["icon"],
+                "feels_like_c": data["current"]["feelslike_c"],
+                "feels_like_f": data["current"]["feelslike_f"],
+                "source": "WeatherAPI",
+                "free_tier": "1 million calls/month"
             }
-            
-            resp = requests.get(url, params=params, timeout=10)
-            
-            if resp.status_code == 200:
-                data = resp.json()
-                return {
-                    "location": data["location"]["name"],
-                    "region": data["location"]["region"],
-                    "country": data["location"]["country"],
-                    "temperature_c": data["current"]["temp_c"],
-                    "temperature_f": data["current"]["temp_f"],
-                    "condition": data["current"]["condition"]["text"],
-                    "humidity": data["current"]["humidity"],
-                    "wind_kph": data["current"]["wind_kph"],
-                    "wind_mph": data["current"]["wind_mph"],
-                    "icon": data["current"]["condition"]["icon"],
-                    "feels_like_c": data["current"]["feelslike_c"],
-                    "feels_like_f": data["current"]["feelslike_f"],
-                    "source": "WeatherAPI",
-                    "free_tier": "1 million calls/month"
-                }
-            elif resp.status_code == 401:
-                return {"error": "Invalid WeatherAPI key - please check your API key"}
-            elif resp.status_code == 429:
-                return {"error": "WeatherAPI rate limit exceeded - free tier allows 1M calls/month"}
-            else:
-                return {"error": f"Weather API error: {resp.status_code} - {resp.text}"}
-                
-        except requests.exceptions.Timeout:
-            return {"error": "Weather API request timed out"}
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Weather API connection error: {str(e)}"}
-        except Exception as e:
-            return {"error": f"Weather error: {str(e)}"}
+            self._weather_cache.set(cache_key, result)
+            return dict(result)
+        elif status == 401:
+            return {"error": "Invalid WeatherAPI key - please check your API key"}
+        elif status == 429:
+            return {"error": "WeatherAPI rate limit exceeded - free tier allows 1M calls/month"}
+        else:
+            return {"error": f"Weather API error: {status} - {body}"}
     
     # ==================== CURRENCY CONVERTER (REAL API) ====================
     
+    @_requires("currency_converter", "Currency Converter")
     def convert_currency(self, amount: float, from_currency: str, to_currency: str) -> Dict[str, Any]:
         """Convert currency using ExchangeRate.host (free tier: 100 requests/month)."""
-        if not self._check_feature_access("currency_converter"):
-            return {"error": "Currency Converter feature not available"}
+        result, request = self._prepare_currency(amount, from_currency, to_currency)
+        return result if request is None else self._call_api(request)
+    
+    @_requires("currency_converter", "Currency Converter")
+    async def aconvert_currency(self, amount: float, from_currency: str, to_currency: str) -> Dict[str, Any]:
+        """Async variant of convert_currency."""
+        result, request = self._prepare_currency(amount, from_currency, to_currency)
+        return result if request is None else await self._acall_api(request)
+    
+    @_requires("currency_converter", "Currency Converter")
+    def convert_currency_batch(self, amounts: Iterable[float], from_currency: str,
+                               to_currency: str) -> Dict[str, Any]:
+        """Convert many amounts between one currency pair, fetching the rate at most once."""
+        result, request = self._prepare_currency(1, from_currency, to_currency)
+        rate_result = result if request is None else self._call_api(request)
+        return self._currency_batch_result(amounts, rate_result)
+    
+    @_requires("currency_converter", "Currency Converter")
+    async def aconvert_currency_batch(self, amounts: Iterable[float], from_currency: str,
+                                      to_currency: str) -> Dict[str, Any]:
+        """Async variant of convert_currency_batch."""
+        result, request = self._prepare_currency(1, from_currency, to_currency)
+        rate_result = result if request is None else await self._acall_api(request)
+        return self._currency_batch_result(amounts, rate_result)
+    
+    def _currency_batch_result(self, amounts: Iterable[float], rate_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a unit conversion's rate to every amount."""
+        if "error" in rate_result:
+            return rate_result
         
+        rate = rate_result["rate"]
+        if not hasattr(amounts, "__len__"):
+            # numpy can't build an array straight from a generator
+            amounts = list(amounts)
         try:
-            # ExchangeRate.host now requires an API key (free registration)
-            api_key = os.getenv("EXCHANGERATE_API_KEY")
-            if not api_key:
-                return {
-                    "error": "ExchangeRate API key not configured",
-                    "setup_required": "Get free API key from https://exchangerate.host/",
-                    "free_tier": "100 requests/month"
-                }
-            
-            url = f"https://api.exchangerate.host/convert"
-            params = {
+            # numpy (imported lazily - it's only needed here) multiplies the
+            # whole batch in one vectorized op
+            import numpy as np
+            converted = (np.asarray(amounts, dtype=np.float64) * rate).tolist()
+        except ImportError:
+            converted = [amount * rate for amount in amounts]
+        
+        return {
+            "from_currency": rate_result["from_currency"],
+            "to_currency": rate_result["to_currency"],
+            "rate": rate,
+            "converted_amounts": converted,
+            "count": len(converted),
+            "date": rate_result["date"],
+            "source": "exchangerate.host",
+            "free_tier": "100 requests/month"
+        }
+    
+    def _prepare_currency(self, amount: float, from_currency: str,
+                          to_currency: str) -> Tuple[Optional[Dict[str, Any]], Optional["_ApiRequest"]]:
+        """Return (result, None) when no call is needed, else (None, request)."""
+        # ExchangeRate.host now requires an API key (free registration)
+        api_key = os.getenv("EXCHANGERATE_API_KEY")
+        if not api_key:
+            return {
+                "error": "ExchangeRate API key not configured",
+                "setup_required": "Get free API key from https://exchangerate.host/",
+                "free_tier": "100 requests/month"
+            }, None
+        
+        cache_key = (from_currency.upper(), to_currency.upper())
+        cached = self._fx_cache.get(cache_key)
+        if cached is not None:
+            rate, date = cached
+            return self._currency_result(amount, cache_key, rate, amount * rate, date), None
+        
+        return None, _ApiRequest(
+            method="GET",
+            url="https://api.exchangerate.host/convert",
+            params={
                 "access_key": api_key,
-                "from": from_currency.upper(),
-                "to": to_currency.upper(),
+                "from": cache_key[0],
+                "to": cache_key[1],
                 "amount": amount
-            }
-            
-            resp = requests.get(url, params=params, timeout=10)
-            
-            if resp.status_code == 200:
-                data = resp.json()
-                if data.get("success"):
-                    return {
-                        "amount": amount,
-                        "from_currency": from_currency.upper(),
-                        "to_currency": to_currency.upper(),
-                        "rate": data["info"]["rate"],
-                        "converted_amount": data["result"],
-                        "date": data["date"],
-                        "source": "exchangerate.host",
-                        "free_tier": "100 requests/month"
-                    }
-                else:
-                    return {"error": f"ExchangeRate API error: {data.get('error', {}).get('info', 'Unknown error')}"}
-            elif resp.status_code == 401:
-                return {"error": "Invalid ExchangeRate API key - please check your API key"}
-            elif resp.status_code == 429:
-                return {"error": "ExchangeRate API rate limit exceeded - free tier allows 100 requests/month"}
+            },
+            timeout=10,
+            api_name="Currency",
+            error_name="Currency conversion",
+            parse=functools.partial(self._parse_currency, amount, cache_key),
+        )
+    
+    def _parse_currency(self, amount: float, cache_key: Tuple[str, str],
+                        status: int, body: str) -> Dict[str, Any]:
+        """Turn an ExchangeRate.host response into a result dict."""
+        if status == 200:
+            data = _loads(body)
+            if data.get("success"):
+                self._fx_cache.set(cache_key, (data["info"]["rate"], data["date"]))
+                return self._currency_result(
+                    amount, cache_key, data["info"]["rate"], data["result"], data["date"]
+                )
             else:
-                return {"error": f"Currency API error: {resp.status_code} - {resp.text}"}
-                
-        except requests.exceptions.Timeout:
-            return {"error": "Currency API request timed out"}
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Currency API connection error: {str(e)}"}
-        except Exception as e:
-            return {"error": f"Currency conversion error: {str(e)}"}
+                return {"error": f"ExchangeRate API error: {data.get('error', {}).get('info', 'Unknown error')}"}
+        elif status == 401:
+            return {"error": "Invalid ExchangeRate API key - please check your API key"}
+        elif status == 429:
+            return {"error": "ExchangeRate API rate limit exceeded - free tier allows 100 requests/month"}
+        else:
+            return {"error": f"Currency API error: {status} - {body}"}
+    
+    def _currency_result(self, amount: float, pair: Tuple[str, str], rate: float,
+                         converted_amount: float, date: str) -> Dict[str, Any]:
+        """Build a currency conversion result."""
+        return {
+            "amount": amount,
+            "from_currency": pair[0],
+            "to_currency": pair[1],
+            "rate": rate,
+            "converted_amount": converted_amount,
+            "date": date,
+            "source": "exchangerate.host",
+            "free_tier": "100 requests/month"
+        }
     
     # ==================== WEB SEARCH (REAL API) ====================
     
+    @_requires("web_search", "Web Search")
     def web_search(self, query: str, max_results: int = 5) -> Dict[str, Any]:
         """Perform web search using ContextualWeb Search API (free tier: 100 requests/day)."""
-        if not self._check_feature_access("web_search"):
-            return {"error": "Web Search feature not available"}
+        result, request = self._prepare_web_search(query, max_results)
+        return result if request is None else self._call_api(request)
+    
+    @_requires("web_search", "Web Search")
+    async def aweb_search(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+        """Async variant of web_search."""
+        result, request = self._prepare_web_search(query, max_results)
+        return result if request is None else await self._acall_api(request)
+    
+    def _prepare_web_search(self, query: str,
+                            max_results: int) -> Tuple[Optional[Dict[str, Any]], Optional["_ApiRequest"]]:
+        """Return (result, None) when no call is needed, else (None, request)."""
+        # ContextualWeb Search API via RapidAPI requires an API key
+        api_key = os.getenv("CONTEXTUALWEB_API_KEY")
+        if not api_key:
+            return {
+                "error": "ContextualWeb API key not configured",
+                "setup_required": "Get free API key from RapidAPI ContextualWeb Search",
+                "free_tier": "100 requests/day"
+            }, None
         
-        try:
-            # ContextualWeb Search API via RapidAPI requires an API key
-            api_key = os.getenv("CONTEXTUALWEB_API_KEY")
-            if not api_key:
-                return {
-                    "error": "ContextualWeb API key not configured",
-                    "setup_required": "Get free API key from RapidAPI ContextualWeb Search",
-                    "free_tier": "100 requests/day"
-                }
-            
-            url = "https://contextualwebsearch-websearch-v1.p.rapidapi.com/api/Search/WebSearchAPI"
-            headers = {
+        cache_key = (query, max_results)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached), None
+        
+        return None, _ApiRequest(
+            method="GET",
+            url="https://contextualwebsearch-websearch-v1.p.rapidapi.com/api/Search/WebSearchAPI",
+            headers={
                 "X-RapidAPI-Key": api_key,
                 "X-RapidAPI-Host": "contextualwebsearch-websearch-v1.p.rapidapi.com"
-            }
-            params = {
+            },
+            params={
                 "q": query,
                 "pageNumber": 1,
                 "pageSize": max_results,
                 "autoCorrect": True,
                 "safeSearch": False
-            }
-            
-            resp = requests.get(url, headers=headers, params=params, timeout=15)
+            },
+            timeout=15,
+            api_name="Web search",
+            error_name="Web search",
+            parse=functools.partial(self._parse_web_search, cache_key),
+        )
+    
+    def _parse_web_search(self, cache_key: Tuple[str, int], status: int, body: str) -> Dict[str, Any]:
+        """Turn a ContextualWeb response into a result dict."""
+        if status == 200:
+            data = _loads(body)
+            results = []
+            for r in data.get("value", []):
+                results.append({
+                    "title": r.get("title", ""),
+                    "url": r.get("url", ""),
+                    "description": r.get("description", ""),
+                    "snippet": r.get("snippet", ""),
+                    "date_published": r.get("datePublished", "")
+                })
             
-            if resp.status_code == 200:
-                data = resp.json()
-                results = []
-                for r in data.get("value", []):
-                    results.append({
-                        "title": r.get("title", ""),
-                        "url": r.get("url", ""),
-                        "description": r.get("description", ""),
-                        "snippet": r.get("snippet", ""),
-                        "date_published": r.get("datePublished", "")
-                    })
-                
-                return {
-                    "query": query,
-                    "results": results,
-                    "count": len(results),
-                    "total_count": data.get("totalCount", 0),
-                    "source": "ContextualWeb Search",
-                    "free_tier": "100 requests/day"
-                }
-            elif resp.status_code == 401:
-                return {"error": "Invalid ContextualWeb API key - please check your RapidAPI key"}
-            elif resp.status_code == 429:
-                return {"error": "ContextualWeb API rate limit exceeded - free tier allows 100 requests/day"}
-            else:
-                return {"error": f"Web search API error: {resp.status_code} - {resp.text}"}
-                
-        except requests.exceptions.Timeout:
-            return {"error": "Web search API request timed out"}
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Web search API connection error: {str(e)}"}
-        except Exception as e:
-            return {"error": f"Web search error: {str(e)}"}
+            result = {
+                "query": cache_key[0],
+                "results": results,
+                "count": len(results),
+                "total_count": data.get("totalCount", 0),
+                "source": "ContextualWeb Search",
+                "free_tier": "100 requests/day"
+            }
+            self._search_cache.set(cache_key, result)
+            return dict(result)
+        elif status == 401:
+            return {"error": "Invalid ContextualWeb API key - please check your RapidAPI key"}
+        elif status == 429:
+            return {"error": "ContextualWeb API rate limit exceeded - free tier allows 100 requests/day"}
+        else:
+            return {"error": f"Web search API error: {status} - {body}"}
     
     # ==================== DICTIONARY (REAL API) ====================
     
+    @_requires("learning_assistant", "Learning Assistant")
     def get_word_definition(self, word: str) -> Dict[str, Any]:
         """Get word definition using Free Dictionary API (always free, no API key required)."""
-        if not self._check_feature_access("learning_assistant"):
-            return {"error": "Learning Assistant feature not available"}
+        result, request = self._prepare_word_definition(word)
+        return result if request is None else self._call_api(request)
+    
+    @_requires("learning_assistant", "Learning Assistant")
+    async def aget_word_definition(self, word: str) -> Dict[str, Any]:
+        """Async variant of get_word_definition."""
+        result, request = self._prepare_word_definition(word)
+        return result if request is None else await self._acall_api(request)
+    
+    def _prepare_word_definition(self, word: str) -> Tuple[Optional[Dict[str, Any]], Optional["_ApiRequest"]]:
+        """Return (result, None) when no call is needed, else (None, request)."""
+        cache_key = word.lower()
+        cached = self._dict_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached, word=word), None
         
-        try:
-            # Free Dictionary API - no API key required
-            url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word.lower()}"
-            
-            resp = requests.get(url, timeout=10)
-            
-            if resp.status_code == 200:
-                data = resp.json()
-                if data:
-                    word_data = data[0]
-                    meanings = []
+        # Free Dictionary API - no API key required
+        return None, _ApiRequest(
+            method="GET",
+            url=f"https://api.dictionaryapi.dev/api/v2/entries/en/{cache_key}",
+            timeout=10,
+            api_name="Dictionary",
+            error_name="Definition",
+            parse=functools.partial(self._parse_word_definition, word, cache_key),
+            conditional=True,
+        )
+    
+    def _parse_word_definition(self, word: str, cache_key: str, status: int, body: str) -> Dict[str, Any]:
+        """Turn a Free Dictionary API response into a result dict."""
+        if status == 200:
+            data = _loads(body)
+            if data:
+                word_data = data[0]
+                meanings = []
+                
+                for meaning in word_data.get("meanings", []):
+                    part_of_speech = meaning.get("partOfSpeech", "")
+                    definitions = []
                     
-                    for meaning in word_data.get("meanings", []):
-                        part_of_speech = meaning.get("partOfSpeech", "")
-                        definitions = []
-                        
-                        for definition in meaning.get("definitions", []):
-                            definitions.append({
-                                "definition": definition.get("definition", ""),
-                                "example": definition.get("example", "")
-                            })
-                        
-                        meanings.append({
-                            "part_of_speech": part_of_speech,
-                            "definitions": definitions
+                    for definition in meaning.get("definitions", []):
+                        definitions.append({
+                            "definition": definition.get("definition", ""),
+                            "example": definition.get("example", "")
                         })
                     
-                    return {
-                        "word": word,
-                        "meanings": meanings,
-                        "phonetic": word_data.get("phonetic", ""),
-                        "origin": word_data.get("origin", ""),
-                        "source": "dictionaryapi.dev",
-                        "free_tier": "Always free, no limits"
-                    }
-                else:
-                    return {"error": f"No definition found for '{word}'"}
-            elif resp.status_code == 404:
-                return {"error": f"Word '{word}' not found in dictionary"}
-            else:
-                return {"error": f"Dictionary API error: {resp.status_code} - {resp.text}"}
+                    meanings.append({
+                        "part_of_speech": part_of_speech,
+                        "definitions": definitions
+                    })
                 
-        except requests.exceptions.Timeout:
-            return {"error": "Dictionary API request timed out"}
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Dictionary API connection error: {str(e)}"}
-        except Exception as e:
-            return {"error": f"Definition error: {str(e)}"}
+                result = {
+                    "word": word,
+                    "meanings": meanings,
+                    "phonetic": word_data.get("phonetic", ""),
+                    "origin": word_data.get("origin", ""),
+                    "source": "dictionaryapi.dev",
+                    "free_tier": "Always free, no limits"
+                }
+                self._dict_cache.set(cache_key, result)
+                return dict(result)
+            else:
+                return {"error": f"No definition found for '{word}'"}
+        elif status == 404:
+            return {"error": f"Word '{word}' not found in dictionary"}
+        else:
+            return {"error": f"Dictionary API error: {status} - {body}"}
     
     # ==================== FILE MANAGER ====================
     
-    def list_files(self, directory: str = ".") -> Dict[str, Any]:
-        """List files in directory."""
-        if not self._check_feature_access("file_manager"):
-            return {"error": "File Manager feature not available"}
-        
+    @_requires("file_manager", "File Manager")
+    def list_files(self, directory: str = ".", detail: bool = True) -> Dict[str, Any]:
+        """List files in directory; ``detail=False`` returns only names and types."""
         try:
             path = Path(directory).resolve()
             if not path.exists():
                 return {"error": "Directory not found"}
             
             files = []
-            for item in path.iterdir():
-                try:
-                    stat = item.stat()
-                    file_info = {
-                        "name": item.name,
-                        "type": "directory" if item.is_dir() else "file",
-                        "size": stat.st_size if item.is_file() else None,
-                        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        "created": datetime.fromtimestamp(stat.st_ctime).isoformat()
-                    }
-                    files.append(file_info)
-                except (PermissionError, OSError):
-                    # Skip files we can't access
-                    continue
+            # DirEntry caches d_type and stat results, so each entry costs at
+            # most one stat() instead of up to three - and none without detail
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                        if not detail:
+                            files.append({
+                                "name": entry.name,
+                                "type": "directory" if is_dir else "file"
+                            })
+                            continue
+                        
+                        stat = entry.stat()
+                        file_info = {
+                            "name": entry.name,
+                            "type": "directory" if is_dir else "file",
+                            "size": stat.st_size if entry.is_file() else None,
+                            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                            "created": datetime.fromtimestamp(stat.st_ctime).isoformat()
+                        }
+                        files.append(file_info)
+                    except (PermissionError, OSError):
+                        # Skip files we can't access
+                        continue
             
             return {
                 "directory": str(path),
@@ -545,16 +1087,19 @@ class HomeFeatures:
     
     # ==================== SYSTEM MONITOR ====================
     
+    @_requires("system_monitor", "System Monitor")
     def get_system_info(self) -> Dict[str, Any]:
         """Get system information."""
-        if not self._check_feature_access("system_monitor"):
-            return {"error": "System Monitor feature not available"}
+        if psutil is None:
+            return {"error": "psutil library not installed - run 'pip install psutil'"}
+        
+        now = time.monotonic()
+        if self._sys_info_cached is not None and now - self._sys_info_ts < _SYSTEM_INFO_TTL:
+            return dict(self._sys_info_cached)
         
         try:
-            import psutil
-            
-            # Get CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage since the previous sample - no blocking interval
+            cpu_percent = psutil.cpu_percent(interval=None)
             
             # Get memory info
             memory = psutil.virtual_memory()
@@ -563,10 +1108,10 @@ class HomeFeatures:
             disk = psutil.disk_usage('/')
             
             # Get boot time
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
+            boot_time = _boot_time()
             uptime = datetime.now() - boot_time
             
-            return {
+            info = {
                 "cpu_percent": cpu_percent,
                 "memory_total_gb": round(memory.total / (1024**3), 2),
                 "memory_available_gb": round(memory.available / (1024**3), 2),
@@ -577,23 +1122,74 @@ class HomeFeatures:
                 "uptime_days": uptime.days,
                 "uptime_hours": uptime.seconds // 3600,
                 "boot_time": boot_time.isoformat(),
-                "platform": platform.system(),
-                "platform_version": platform.version(),
-                "python_version": platform.python_version(),
-                "architecture": platform.architecture()[0]
+                **_platform_info()
             }
-        except ImportError:
-            return {"error": "psutil library not installed - run 'pip install psutil'"}
+            self._sys_info_cached = info
+            self._sys_info_ts = now
+            return dict(info)
         except Exception as e:
             return {"error": f"System info error: {str(e)}"}
     
     # ==================== OCR (REAL API) ====================
     
+    @_requires("ocr", "OCR")
     def extract_text_from_image(self, image_path: str) -> Dict[str, Any]:
         """Extract text from image using OCR.Space API (free tier: 500 requests/day)."""
-        if not self._check_feature_access("ocr"):
-            return {"error": "OCR feature not available"}
+        result, file_size, headers = self._prepare_ocr(image_path)
+        if result is not None:
+            return result
         
+        http = self._get_http()
+        try:
+            with open(image_path, 'rb') as image_file:
+                resp = http.post(
+                    _OCR_URL,
+                    files={'file': image_file},
+                    data=_OCR_FORM,
+                    headers=headers,
+                    timeout=30
+                )
+            return self._parse_ocr(image_path, file_size, resp.status_code, resp.text)
+        except requests.exceptions.Timeout:
+            return {"error": "OCR API request timed out"}
+        except requests.exceptions.RequestException as e:
+            return {"error": f"OCR API connection error: {str(e)}"}
+        except Exception as e:
+            return {"error": f"OCR error: {str(e)}"}
+    
+    @_requires("ocr", "OCR")
+    async def aextract_text_from_image(self, image_path: str) -> Dict[str, Any]:
+        """Async variant of extract_text_from_image."""
+        result, file_size, headers = self._prepare_ocr(image_path)
+        if result is not None:
+            return result
+        
+        session = await self._get_aio_session()
+        try:
+            # aiohttp streams a file payload in chunks (read in its executor)
+            # rather than holding the whole image in memory
+            with open(image_path, 'rb') as image_file:
+                form = aiohttp.FormData()
+                for key, value in _OCR_FORM.items():
+                    form.add_field(key, str(value))
+                form.add_field('file', image_file, filename=os.path.basename(image_path))
+                
+                async with self._aio_limit, session.post(
+                    _OCR_URL,
+                    data=form,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=30),
+                ) as resp:
+                    return self._parse_ocr(image_path, file_size, resp.status, await resp.text())
+        except asyncio.TimeoutError:
+            return {"error": "OCR API request timed out"}
+        except aiohttp.ClientError as e:
+            return {"error": f"OCR API connection error: {str(e)}"}
+        except Exception as e:
+            return {"error": f"OCR error: {str(e)}"}
+    
+    def _prepare_ocr(self, image_path: str) -> Tuple[Optional[Dict[str, Any]], int, Dict[str, str]]:
+        """Return (result, 0, {}) when no call is needed, else (None, file size, headers)."""
         try:
             # OCR.Space requires an API key
             api_key = os.getenv("OCRSPACE_API_KEY")
@@ -602,65 +1198,47 @@ class HomeFeatures:
                     "error": "OCR.Space API key not configured",
                     "setup_required": "Get free API key from https://ocr.space/",
                     "free_tier": "500 requests/day, 1MB file size limit"
-                }
+                }, 0, {}
             
-            # Check if file exists and is an image
-            if not os.path.exists(image_path):
-                return {"error": f"Image file not found: {image_path}"}
+            # One stat() answers both the existence and the size check
+            try:
+                file_size = os.stat(image_path).st_size
+            except FileNotFoundError:
+                return {"error": f"Image file not found: {image_path}"}, 0, {}
             
             # Check file size (free tier limit: 1MB)
-            file_size = os.path.getsize(image_path)
             if file_size > 1024 * 1024:  # 1MB
-                return {"error": "File size exceeds free tier limit (1MB)"}
+                return {"error": "File size exceeds free tier limit (1MB)"}, 0, {}
             
-            with open(image_path, 'rb') as image_file:
-                files = {'file': image_file}
-                data = {
-                    'language': 'eng',
-                    'isOverlayRequired': False,
-                    'filetype': 'png',
-                    'detectOrientation': True
+            return None, file_size, {'apikey': api_key}
+        except Exception as e:
+            return {"error": f"OCR error: {str(e)}"}, 0, {}
+    
+    def _parse_ocr(self, image_path: str, file_size: int, status: int, body: str) -> Dict[str, Any]:
+        """Turn an OCR.Space response into a result dict."""
+        if status == 200:
+            result = _loads(body)
+            
+            if result.get('IsErroredOnProcessing'):
+                return {"error": f"OCR processing error: {result.get('ErrorMessage', 'Unknown error')}"}
+            
+            parsed_results = result.get('ParsedResults', [])
+            if parsed_results:
+                parsed = parsed_results[0]
+                return {
+                    "image_path": image_path,
+                    "extracted_text": parsed.get('ParsedText', '').strip(),
+                    "confidence": parsed.get('MeanConfidence', None),
+                    "file_size_bytes": file_size,
+                    "source": "ocr.space",
+                    "free_tier": "500 requests/day, 1MB file size limit"
                 }
-                headers = {'apikey': api_key}
-                
-                resp = requests.post(
-                    'https://api.ocr.space/parse/image',
-                    files=files,
-                    data=data,
-                    headers=headers,
-                    timeout=30
-                )
+            else:
+                return {"error": "No text found in image"}
                 
-                if resp.status_code == 200:
-                    result = resp.json()
-                    
-                    if result.get('IsErroredOnProcessing'):
-                        return {"error": f"OCR processing error: {result.get('ErrorMessage', 'Unknown error')}"}
-                    
-                    parsed_results = result.get('ParsedResults', [])
-                    if parsed_results:
-                        parsed = parsed_results[0]
-                        return {
-                            "image_path": image_path,
-                            "extracted_text": parsed.get('ParsedText', '').strip(),
-                            "confidence": parsed.get('MeanConfidence', None),
-                            "file_size_bytes": file_size,
-                            "source": "ocr.space",
-                            "free_tier": "500 requests/day, 1MB file size limit"
-                        }
-                    else:
-                        return {"error": "No text found in image"}
-                        
-                elif resp.status_code == 401:
-                    return {"error": "Invalid OCR.Space API key - please check your API key"}
-                elif resp.status_code == 429:
-                    return {"error": "OCR.Space API rate limit exceeded - free tier allows 500 requests/day"}
-                else:
-                    return {"error": f"OCR API error: {resp.status_code} - {resp.text}"}
-                    
-        except requests.exceptions.Timeout:
-            return {"error": "OCR API request timed out"}
-        except requests.exceptions.RequestException as e:
-            return {"error": f"OCR API connection error: {str(e)}"}
-        except Exception as e:
-            return {"error": f"OCR error: {str(e)}"} 
\ No newline at end of file
+        elif status == 401:
+            return {"error": "Invalid OCR.Space API key - please check your API key"}
+        elif status == 429:
+            return {"error": "OCR.Space API rate limit exceeded - free tier allows 500 requests/day"}
+        else:
+            return {"error": f"OCR API error: {status} - {body}"} 
\ No newline at end of file
@@ -1,3 +1,52 @@
+import ast
+import functools
+import math
+import types
+from typing import Any, Dict
+
+from .._calc import check_constant, check_power
+
+# Functions and constants an expression may reference by name
+_SAFE_FUNCS: Dict[str, Any] = {
+    name: getattr(math, name)
+    for name in (
+        "sqrt", "exp", "log", "log2", "log10", "sin", "cos", "tan", "asin", "acos",
+        "atan", "atan2", "sinh", "cosh", "tanh", "degrees", "radians", "hypot",
+        "floor", "ceil", "fabs", "pi", "e", "tau",
+    )
+}
+_SAFE_FUNCS.update(abs=abs, round=round, min=min, max=max)
+
+_SAFE_NODES = frozenset({
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Call, ast.Name, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.USub, ast.UAdd,
+})
+
+
+def _check_node(node: ast.AST):
+    """Reject names, calls and powers outside the calculator's whitelist."""
+    if type(node) not in _SAFE_NODES:
+        raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+    if isinstance(node, ast.Name) and node.id not in _SAFE_FUNCS:
+        raise ValueError(f"Unknown name: {node.id}")
+    if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.keywords):
+        raise ValueError("Only positional calls to math functions are supported")
+    if isinstance(node, ast.Constant):
+        check_constant(node)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+        check_power(node)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(expression: str) -> types.CodeType:
+    """Parse, whitelist-check and compile an expression once."""
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        _check_node(node)
+    return compile(tree, "<expr>", "eval")
+
+
 class Calculator:
     """
     A robust calculator for basic and advanced arithmetic operations.
@@ -47,14 +96,9 @@ class Calculator:
         """
         Evaluates a mathematical expression string. Uses a safe approach.
         """
-        # This is a simplified example. For a production system, consider using a dedicated
-        # expression parsing library (e.g., asteval, numexpr) to prevent arbitrary code execution.
         try:
-            # Basic validation to prevent common injection attacks
-            if any(char in expression for char in ['__', 'import', 'os', 'sys', 'exec', 'eval']):
-                raise ValueError("Invalid characters in expression.")
-            return eval(expression) # nosec
-        except (SyntaxError, TypeError, NameError, ValueError) as e:
+            return eval(_compile(expression), {"__builtins__": {}}, _SAFE_FUNCS) # nosec
+        except (SyntaxError, TypeError, NameError, ValueError, ArithmeticError, MemoryError) as e:
             raise ValueError(f"Invalid expression: {e}")
 
 calculator = Calculator()
\ No newline at end of file
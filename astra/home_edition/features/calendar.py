@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 
 from astra.core.database import database_manager, CalendarEvent
@@ -16,18 +17,31 @@ def add_event(user_id: int, title: str, start_time: datetime, end_time: datetime
     :param description: The description of the event.
     :return: The created event.
     """
-    with database_manager.get_session() as session:
-        event = CalendarEvent(
-            user_id=user_id,
-            title=title,
-            start_time=start_time,
-            end_time=end_time,
-            description=description
-        )
-        session.add(event)
+    return add_events(user_id, [{
+        "title": title,
+        "start_time": start_time,
+        "end_time": end_time,
+        "description": description
+    }])[0]
+
+def add_events(user_id: int, events: Iterable[Dict[str, Any]]) -> List[CalendarEvent]:
+    """
+    Adds several events for a specific user in a single transaction.
+
+    :param user_id: The ID of the user.
+    :param events: Dicts with title, start_time, end_time and optional description.
+    :return: The created events, in the order given.
+    """
+    rows = [{"description": None, **event, "user_id": user_id} for event in events]
+    if not rows:
+        return []
+    # INSERT ... RETURNING hands back ids and defaults in one statement, and
+    # expire_on_commit=False keeps them loaded, so no per-event refresh
+    with database_manager.SessionLocal(expire_on_commit=False) as session:
+        stmt = insert(CalendarEvent).returning(CalendarEvent, sort_by_parameter_order=True)
+        created = list(session.scalars(stmt, rows))
         session.commit()
-        session.refresh(event)
-        return event
+        return created
 
 def get_events(user_id: int, start_date: datetime, end_date: datetime) -> List[CalendarEvent]:
     """
@@ -39,11 +53,11 @@ def get_events(user_id: int, start_date: datetime, end_date: datetime) -> List[C
     :return: A list of events.
     """
     with database_manager.get_session() as session:
-        return session.query(CalendarEvent).filter(
+        return list(session.scalars(select(CalendarEvent).where(
             CalendarEvent.user_id == user_id,
             CalendarEvent.start_time >= start_date,
             CalendarEvent.end_time <= end_date
-        ).all()
+        )))
 
 def delete_event(user_id: int, event_id: int) -> bool:
     """
@@ -53,13 +67,23 @@ def delete_event(user_id: int, event_id: int) -> bool:
     :param event_id: The ID of the event to delete.
     :return: True if the event was deleted, False otherwise.
     """
+    return delete_events(user_id, [event_id]) > 0
+
+def delete_events(user_id: int, event_ids: Iterable[int]) -> int:
+    """
+    Deletes several events for a specific user in a single statement.
+
+    :param user_id: The ID of the user.
+    :param event_ids: The IDs of the events to delete.
+    :return: The number of events deleted.
+    """
+    event_ids = list(event_ids)
+    if not event_ids:
+        return 0
     with database_manager.get_session() as session:
-        event = session.query(CalendarEvent).filter(
-            CalendarEvent.id == event_id,
-            CalendarEvent.user_id == user_id
-        ).first()
-        if event:
-            session.delete(event)
-            session.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = session.execute(delete(CalendarEvent).where(
+            CalendarEvent.user_id == user_id,
+            CalendarEvent.id.in_(event_ids)
+        )).rowcount
+        session.commit()
+        return deleted
@@ -1,8 +1,16 @@
+import asyncio
 import requests
 from typing import Optional, Dict
 
+from astra.core.logging import get_logger
+
+from .._http import SESSION, ClientError, get_session, ttl_cache
+
+logger = get_logger("astra.home.crypto")
+
 COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
 
+@ttl_cache(60, "crypto_price", COINGECKO_API_URL)
 def get_crypto_price(crypto_id: str, vs_currency: str = 'usd') -> Optional[Dict[str, float]]:
     """
     Gets the price of a cryptocurrency from CoinGecko.
@@ -15,7 +23,7 @@ def get_crypto_price(crypto_id: str, vs_currency: str = 'usd') -> Optional[Dict[
         A dictionary containing the price, or None if an error occurs.
     """
     try:
-        response = requests.get(f"{COINGECKO_API_URL}/simple/price", params={
+        response = SESSION.get(f"{COINGECKO_API_URL}/simple/price", params={
             'ids': crypto_id,
             'vs_currencies': vs_currency
         })
@@ -23,6 +31,20 @@ def get_crypto_price(crypto_id: str, vs_currency: str = 'usd') -> Optional[Dict[
         data = response.json()
         return data.get(crypto_id)
     except requests.exceptions.RequestException as e:
-        # Log the exception here in a real application
-        print(f"Error fetching crypto price: {e}")
-        return None
\ No newline at end of file
+        logger.error("Error fetching crypto price", error=str(e))
+        return None
+
+@ttl_cache(60, "crypto_price", COINGECKO_API_URL)
+async def aget_crypto_price(crypto_id: str, vs_currency: str = 'usd') -> Optional[Dict[str, float]]:
+    """Async variant of get_crypto_price over the shared aiohttp session."""
+    try:
+        async with get_session().get(f"{COINGECKO_API_URL}/simple/price", params={
+            'ids': crypto_id,
+            'vs_currencies': vs_currency
+        }) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+        return data.get(crypto_id)
+    except (ClientError, asyncio.TimeoutError) as e:
+        logger.error("Error fetching crypto price", error=str(e))
+        return None
@@ -1,8 +1,67 @@
+import asyncio
 import requests
 from typing import Optional, Dict, Any
 
+from astra.core.logging import get_logger
+
+from .._http import SESSION, ClientError, get_session, ttl_cache
+
+logger = get_logger("astra.home.currency")
+
 EXCHANGERATE_API_URL = "https://api.exchangerate.host/latest"
 
+def _rate_params(from_currency: str, to_currency: str) -> Dict[str, str]:
+    """Build the ExchangeRate.host query for one currency pair."""
+    return {
+        'base': from_currency.upper(),
+        'symbols': to_currency.upper()
+    }
+
+def _parse_rate(to_currency: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pull the pair rate out of an ExchangeRate.host response."""
+    if data.get("success"):
+        return {"rate": data["rates"][to_currency], "date": data["date"]}
+    else:
+        return {"error": data.get("error", {}).get("info", "Unknown error from API.")}
+
+def _conversion_result(amount: float, from_currency: str, to_currency: str, rate: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a cached pair rate to an amount."""
+    if "error" in rate:
+        return rate
+    return {
+        "amount": amount,
+        "from_currency": from_currency.upper(),
+        "to_currency": to_currency.upper(),
+        "rate": rate["rate"],
+        "converted_amount": amount * rate["rate"],
+        "date": rate["date"]
+    }
+
+# Rates are cached per currency pair, so any amount reuses the hourly rate
+@ttl_cache(3600, "exchange_rate", EXCHANGERATE_API_URL)
+def _get_rate(base: str, symbols: str) -> Dict[str, Any]:
+    """Fetch one pair rate from ExchangeRate.host."""
+    try:
+        response = SESSION.get(EXCHANGERATE_API_URL, params={'base': base, 'symbols': symbols})
+        response.raise_for_status()  # Raise an exception for bad status codes
+        return _parse_rate(symbols, response.json())
+
+    except requests.exceptions.RequestException as e:
+        logger.error("Error during currency conversion", error=str(e))
+        return {"error": f"Failed to retrieve exchange rates: {e}"}
+
+@ttl_cache(3600, "exchange_rate", EXCHANGERATE_API_URL)
+async def _aget_rate(base: str, symbols: str) -> Dict[str, Any]:
+    """Async _get_rate over the shared aiohttp session."""
+    try:
+        async with get_session().get(EXCHANGERATE_API_URL, params={'base': base, 'symbols': symbols}) as response:
+            response.raise_for_status()
+            return _parse_rate(symbols, await response.json(content_type=None))
+
+    except (ClientError, asyncio.TimeoutError) as e:
+        logger.error("Error during currency conversion", error=str(e))
+        return {"error": f"Failed to retrieve exchange rates: {e}"}
+
 def convert_currency(amount: float, from_currency: str, to_currency: str) -> Optional[Dict[str, Any]]:
     """
     Converts an amount from one currency to another using ExchangeRate.host.
@@ -15,29 +74,10 @@ def convert_currency(amount: float, from_currency: str, to_currency: str) -> Opt
     Returns:
         A dictionary containing the conversion result, or None if an error occurs.
     """
-    try:
-        response = requests.get(EXCHANGERATE_API_URL, params={
-            'base': from_currency.upper(),
-            'symbols': to_currency.upper()
-        })
-        response.raise_for_status()  # Raise an exception for bad status codes
-        data = response.json()
-
-        if data.get("success"):
-            rate = data["rates"][to_currency.upper()]
-            converted_amount = amount * rate
-            return {
-                "amount": amount,
-                "from_currency": from_currency.upper(),
-                "to_currency": to_currency.upper(),
-                "rate": rate,
-                "converted_amount": converted_amount,
-                "date": data["date"]
-            }
-        else:
-            return {"error": data.get("error", {}).get("info", "Unknown error from API.")}
+    rate = _get_rate(**_rate_params(from_currency, to_currency))
+    return _conversion_result(amount, from_currency, to_currency, rate)
 
-    except requests.exceptions.RequestException as e:
-        # Log the exception here in a real application
-        print(f"Error during currency conversion: {e}")
-        return {"error": f"Failed to retrieve exchange rates: {e}"}
\ No newline at end of file
+async def aconvert_currency(amount: float, from_currency: str, to_currency: str) -> Optional[Dict[str, Any]]:
+    """Async variant of convert_currency over the shared aiohttp session."""
+    rate = await _aget_rate(**_rate_params(from_currency, to_currency))
+    return _conversion_result(amount, from_currency, to_currency, rate)
@@ -1,8 +1,16 @@
+import asyncio
 import requests
 from typing import Optional, List, Dict, Any
 
+from astra.core.logging import get_logger
+
+from .._http import SESSION, ClientError, get_session, ttl_cache
+
+logger = get_logger("astra.home.dictionary")
+
 DICTIONARY_API_URL = "https://api.dictionaryapi.dev/api/v2/entries/en"
 
+@ttl_cache(86400, "word_definition", DICTIONARY_API_URL)
 def get_word_definition(word: str) -> Optional[List[Dict[str, Any]]]:
     """
     Gets the definition of a word from the Free Dictionary API.
@@ -14,11 +22,21 @@ def get_word_definition(word: str) -> Optional[List[Dict[str, Any]]]:
         A list of dictionaries containing word definitions, or None if an error occurs.
     """
     try:
-        response = requests.get(f"{DICTIONARY_API_URL}/{word}")
+        response = SESSION.get(f"{DICTIONARY_API_URL}/{word}")
         response.raise_for_status()  # Raise an exception for bad status codes
         data = response.json()
         return data
     except requests.exceptions.RequestException as e:
-        # Log the exception here in a real application
-        print(f"Error fetching word definition: {e}")
-        return None
\ No newline at end of file
+        logger.error("Error fetching word definition", error=str(e))
+        return None
+
+@ttl_cache(86400, "word_definition", DICTIONARY_API_URL)
+async def aget_word_definition(word: str) -> Optional[List[Dict[str, Any]]]:
+    """Async variant of get_word_definition over the shared aiohttp session."""
+    try:
+        async with get_session().get(f"{DICTIONARY_API_URL}/{word}") as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+    except (ClientError, asyncio.TimeoutError) as e:
+        logger.error("Error fetching word definition", error=str(e))
+        return None
@@ -1,7 +1,68 @@
+import errno
 import os
 import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+
+from astra.core.logging import get_logger
+
+logger = get_logger("astra.home.file_manager")
+
+# Filesystems where each stat() is a network round trip
+_REMOTE_FS_TYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "sshfs", "9p",
+    "afs", "ceph", "glusterfs", "fuse.glusterfs", "fuse.rclone", "davfs", "fuse.s3fs",
+})
+# Below this many entries the serial stat loop is cheaper than dispatching
+_PARALLEL_STAT_MIN = 16
+# stat() releases the GIL, so threads overlap remote round trips
+_STAT_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="astra-stat")
+# st_dev -> whether that filesystem is remote
+_remote_devices: Dict[int, bool] = {}
+
+def _mount_fstype(path: str) -> Optional[str]:
+    """Return the fstype of the mount containing path, from /proc/mounts."""
+    try:
+        with open("/proc/mounts") as mounts:
+            entries = [line.split()[1:3] for line in mounts]
+    except OSError:
+        return None
+    path = os.path.realpath(path)
+    best, fstype = "", None
+    for mount_point, mount_fstype in entries:
+        # /proc/mounts escapes spaces in mount points as \040
+        mount_point = mount_point.replace("\\040", " ")
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) >= len(best):
+            best, fstype = mount_point, mount_fstype
+    return fstype
+
+def is_remote_path(path: str) -> bool:
+    """
+    Checks whether path lives on a network filesystem (NFS, SMB, sshfs, ...).
+
+    Args:
+        path: The path to check.
+
+    Returns:
+        True if the containing filesystem is remote, False otherwise or if unknown.
+    """
+    try:
+        device = os.stat(path).st_dev
+    except OSError:
+        return False
+    remote = _remote_devices.get(device)
+    if remote is None:
+        remote = _remote_devices[device] = _mount_fstype(path) in _REMOTE_FS_TYPES
+    return remote
+
+def _safe_stat(entry: os.DirEntry) -> Union[os.stat_result, OSError]:
+    """Stat a directory entry, returning the error instead of raising."""
+    try:
+        return entry.stat()
+    except OSError as e:
+        return e
 
 def list_directory_contents(path: str) -> List[Dict[str, Any]]:
     """
@@ -20,25 +81,31 @@ def list_directory_contents(path: str) -> List[Dict[str, Any]]:
 
     contents = []
     try:
-        for item in os.listdir(path):
-            item_path = os.path.join(path, item)
+        with os.scandir(path) as it:
+            entries = list(it)
+        # One stat per entry; on remote filesystems they run concurrently
+        if len(entries) >= _PARALLEL_STAT_MIN and is_remote_path(path):
+            stats = _STAT_POOL.map(_safe_stat, entries)
+        else:
+            stats = map(_safe_stat, entries)
+        for entry, st in zip(entries, stats):
             try:
-                is_dir = os.path.isdir(item_path)
-                size = os.path.getsize(item_path) if not is_dir else 0
-                created_at = datetime.fromtimestamp(os.path.getctime(item_path)).isoformat()
-                modified_at = datetime.fromtimestamp(os.path.getmtime(item_path)).isoformat()
+                if isinstance(st, OSError):
+                    raise st
+                # is_dir() reuses d_type or the cached stat
+                is_dir = entry.is_dir()
                 contents.append({
-                    "name": item,
-                    "path": item_path,
+                    "name": entry.name,
+                    "path": entry.path,
                     "is_directory": is_dir,
-                    "size": size, # in bytes
-                    "created_at": created_at,
-                    "modified_at": modified_at
+                    "size": st.st_size if not is_dir else 0, # in bytes
+                    "created_at": datetime.fromtimestamp(st.st_ctime).isoformat(),
+                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat()
                 })
             except OSError as e:
                 # Log permission errors or other issues with specific files/dirs
-                print(f"Warning: Could not access {item_path} - {e}")
-                contents.append({"name": item, "path": item_path, "error": str(e)})
+                logger.warning("Could not access directory entry", path=entry.path, error=str(e))
+                contents.append({"name": entry.name, "path": entry.path, "error": str(e)})
     except OSError as e:
         return [{"error": f"Error listing directory {path}: {e}"}]
     return contents
@@ -133,6 +200,55 @@ def move_path(source_path: str, destination_path: str) -> Dict[str, Any]:
     except shutil.Error as e:
         return {"status": "error", "message": f"Error moving {source_path} to {destination_path}: {e}"}
 
+# Errors meaning the kernel copy fast path doesn't apply to this pair of files
+_COPY_FALLBACK_ERRNOS = frozenset({
+    errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF,
+})
+
+def _kernel_copy(fsrc, fdst, size: int):
+    """Copy in-kernel with copy_file_range (reflink on CoW filesystems), then sendfile."""
+    src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+    copiers = []
+    if hasattr(os, "copy_file_range"):
+        copiers.append(lambda count: os.copy_file_range(src_fd, dst_fd, count))
+    if hasattr(os, "sendfile"):
+        copiers.append(lambda count: os.sendfile(dst_fd, src_fd, None, count))
+    copied = 0
+    # An empty st_size (procfs/sysfs) says nothing about the content; let
+    # the user-space copy read to EOF
+    if size > 0:
+        for copy in copiers:
+            try:
+                while copied < size:
+                    sent = copy(size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+                continue
+            # Nothing at offset 0 means this syscall can't read the file
+            # (some FUSE filesystems, older cross-fs kernels), not EOF
+            if copied > 0:
+                return
+    # Neither syscall worked; finish from the current offsets in user space
+    shutil.copyfileobj(fsrc, fdst)
+
+def _fast_copy(src: str, dst: str) -> str:
+    """copy2 replacement that keeps file data in the kernel where possible."""
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    # Stat before opening: opening a FIFO for reading would block
+    if not stat.S_ISREG(os.stat(src).st_mode):
+        return shutil.copy2(src, dst)
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        _kernel_copy(fsrc, fdst, os.fstat(fsrc.fileno()).st_size)
+    shutil.copystat(src, dst)
+    return dst
+
 def copy_path(source_path: str, destination_path: str) -> Dict[str, Any]:
     """
     Copies a file or directory from source to destination.
@@ -151,9 +267,9 @@ def copy_path(source_path: str, destination_path: str) -> Dict[str, Any]:
 
     try:
         if os.path.isfile(source_path):
-            shutil.copy2(source_path, destination_path)
+            _fast_copy(source_path, destination_path)
         elif os.path.isdir(source_path):
-            shutil.copytree(source_path, destination_path)
+            shutil.copytree(source_path, destination_path, copy_function=_fast_copy)
         return {"status": "success", "message": f"Copied {source_path} to {destination_path}."}
     except shutil.Error as e:
         return {"status": "error", "message": f"Error copying {source_path} to {destination_path}: {e}"}
\ No newline at end of file
@@ -4,214 +4,233 @@ News Feature
 News headlines and articles using NewsAPI (free tier: 100 requests/day).
 """
 
+import asyncio
 import os
 import requests
-from typing import Dict, Any, List, Optional
+from typing import Any, Callable, Dict, Optional
 from astra.core.logging import get_logger
 from astra.home_edition.drm import verify_feature_access
 
+from .._http import SESSION, ClientError, get_session, ttl_cache
+
+NEWSAPI_URL = "https://newsapi.org/v2"
+
+
+def _format_article(article: Dict[str, Any], with_content: bool = False) -> Dict[str, Any]:
+    """Reduce a NewsAPI article to the fields Astra returns."""
+    formatted = {
+        "title": article.get("title", ""),
+        "description": article.get("description", ""),
+        "url": article.get("url", ""),
+        "image_url": article.get("urlToImage", ""),
+        "published_at": article.get("publishedAt", ""),
+        "source": article.get("source", {}).get("name", ""),
+        "author": article.get("author", "")
+    }
+    if with_content:
+        formatted["content"] = article.get("content", "")
+    return formatted
+
+
+def _format_source(source: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a NewsAPI source to the fields Astra returns."""
+    return {
+        "id": source.get("id", ""),
+        "name": source.get("name", ""),
+        "description": source.get("description", ""),
+        "url": source.get("url", ""),
+        "category": source.get("category", ""),
+        "language": source.get("language", ""),
+        "country": source.get("country", "")
+    }
+
 
 class NewsFeature:
     """News feature using NewsAPI."""
     
     def __init__(self):
         self.logger = get_logger("astra.home.news")
-        
+    
     def _check_feature_access(self) -> bool:
         """Check if user has access to news feature."""
         return verify_feature_access("news")
     
-    def get_top_headlines(self, country: str = "us", category: Optional[str] = None) -> Dict[str, Any]:
-        """Get top headlines by country and category."""
-        if not self._check_feature_access():
-            return {"error": "News feature not available"}
-        
+    def _with_api_key(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Add the NewsAPI key to params, or return None if it is not configured."""
+        api_key = os.getenv("NEWSAPI_KEY")
+        if not api_key:
+            return None
+        return {"apiKey": api_key, **params}
+    
+    @staticmethod
+    def _missing_key_error() -> Dict[str, Any]:
+        """Error returned when NEWSAPI_KEY is unset."""
+        return {
+            "error": "NewsAPI key not configured",
+            "setup_required": "Get free API key from https://newsapi.org/",
+            "free_tier": "100 requests/day"
+        }
+    
+    @staticmethod
+    def _result(status: int, data: Optional[Dict[str, Any]], text: str, label: str,
+                build: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Map a NewsAPI status and body to Astra's response shape."""
+        if status == 200:
+            if data.get("status") == "ok":
+                return build(data)
+            return {"error": f"NewsAPI error: {data.get('message', 'Unknown error')}"}
+        elif status == 401:
+            return {"error": "Invalid NewsAPI key - please check your API key"}
+        elif status == 429:
+            return {"error": "NewsAPI rate limit exceeded - free tier allows 100 requests/day"}
+        return {"error": f"{label} API error: {status} - {text}"}
+    
+    def _fetch(self, endpoint: str, params: Dict[str, Any], label: str,
+               build: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """GET a NewsAPI endpoint and build the response."""
         try:
-            api_key = os.getenv("NEWSAPI_KEY")
-            if not api_key:
-                return {
-                    "error": "NewsAPI key not configured",
-                    "setup_required": "Get free API key from https://newsapi.org/",
-                    "free_tier": "100 requests/day"
-                }
-            
-            url = "https://newsapi.org/v2/top-headlines"
-            params = {
-                "apiKey": api_key,
-                "country": country.lower(),
-                "pageSize": 20
-            }
-            
-            if category:
-                params["category"] = category.lower()
-            
-            resp = requests.get(url, params=params, timeout=10)
+            params = self._with_api_key(params)
+            if params is None:
+                return self._missing_key_error()
             
-            if resp.status_code == 200:
-                data = resp.json()
-                if data.get("status") == "ok":
-                    articles = []
-                    for article in data.get("articles", []):
-                        articles.append({
-                            "title": article.get("title", ""),
-                            "description": article.get("description", ""),
-                            "url": article.get("url", ""),
-                            "image_url": article.get("urlToImage", ""),
-                            "published_at": article.get("publishedAt", ""),
-                            "source": article.get("source", {}).get("name", ""),
-                            "author": article.get("author", "")
-                        })
-                    
-                    return {
-                        "country": country,
-                        "category": category,
-                        "articles": articles,
-                        "total_results": data.get("totalResults", 0),
-                        "source": "NewsAPI",
-                        "free_tier": "100 requests/day"
-                    }
-                else:
-                    return {"error": f"NewsAPI error: {data.get('message', 'Unknown error')}"}
-            elif resp.status_code == 401:
-                return {"error": "Invalid NewsAPI key - please check your API key"}
-            elif resp.status_code == 429:
-                return {"error": "NewsAPI rate limit exceeded - free tier allows 100 requests/day"}
-            else:
-                return {"error": f"News API error: {resp.status_code} - {resp.text}"}
-                
+            resp = SESSION.get(f"{NEWSAPI_URL}/{endpoint}", params=params, timeout=10)
+            data = resp.json() if resp.status_code == 200 else None
+            return self._result(resp.status_code, data, resp.text if data is None else "", label, build)
+        
         except requests.exceptions.Timeout:
-            return {"error": "News API request timed out"}
+            return {"error": f"{label} API request timed out"}
         except requests.exceptions.RequestException as e:
-            return {"error": f"News API connection error: {str(e)}"}
+            return {"error": f"{label} API connection error: {str(e)}"}
         except Exception as e:
-            return {"error": f"News error: {str(e)}"}
+            return {"error": f"{label} error: {str(e)}"}
     
-    def search_news(self, query: str, language: str = "en", sort_by: str = "publishedAt") -> Dict[str, Any]:
-        """Search for news articles."""
-        if not self._check_feature_access():
-            return {"error": "News feature not available"}
-        
+    async def _afetch(self, endpoint: str, params: Dict[str, Any], label: str,
+                      build: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Async _fetch over the shared aiohttp session."""
         try:
-            api_key = os.getenv("NEWSAPI_KEY")
-            if not api_key:
-                return {
-                    "error": "NewsAPI key not configured",
-                    "setup_required": "Get free API key from https://newsapi.org/",
-                    "free_tier": "100 requests/day"
-                }
-            
-            url = "https://newsapi.org/v2/everything"
-            params = {
-                "apiKey": api_key,
-                "q": query,
-                "language": language,
-                "sortBy": sort_by,
-                "pageSize": 20
-            }
+            params = self._with_api_key(params)
+            if params is None:
+                return self._missing_key_error()
             
-            resp = requests.get(url, params=params, timeout=10)
-            
-            if resp.status_code == 200:
-                data = resp.json()
-                if data.get("status") == "ok":
-                    articles = []
-                    for article in data.get("articles", []):
-                        articles.append({
-                            "title": article.get("title", ""),
-                            "description": article.get("description", ""),
-                            "url": article.get("url", ""),
-                            "image_url": article.get("urlToImage", ""),
-                            "published_at": article.get("publishedAt", ""),
-                            "source": article.get("source", {}).get("name", ""),
-                            "author": article.get("author", ""),
-                            "content": article.get("content", "")
-                        })
-                    
-                    return {
-                        "query": query,
-                        "language": language,
-                        "sort_by": sort_by,
-                        "articles": articles,
-                        "total_results": data.get("totalResults", 0),
-                        "source": "NewsAPI",
-                        "free_tier": "100 requests/day"
-                    }
+            async with get_session().get(f"{NEWSAPI_URL}/{endpoint}", params=params) as resp:
+                if resp.status == 200:
+                    data, text = await resp.json(content_type=None), ""
                 else:
-                    return {"error": f"NewsAPI error: {data.get('message', 'Unknown error')}"}
-            elif resp.status_code == 401:
-                return {"error": "Invalid NewsAPI key - please check your API key"}
-            elif resp.status_code == 429:
-                return {"error": "NewsAPI rate limit exceeded - free tier allows 100 requests/day"}
-            else:
-                return {"error": f"News search API error: {resp.status_code} - {resp.text}"}
-                
-        except requests.exceptions.Timeout:
-            return {"error": "News search API request timed out"}
-        except requests.exceptions.RequestException as e:
-            return {"error": f"News search API connection error: {str(e)}"}
+                    data, text = None, await resp.text()
+            return self._result(resp.status, data, text, label, build)
+        
+        except asyncio.TimeoutError:
+            return {"error": f"{label} API request timed out"}
+        except ClientError as e:
+            return {"error": f"{label} API connection error: {str(e)}"}
         except Exception as e:
-            return {"error": f"News search error: {str(e)}"}
+            return {"error": f"{label} error: {str(e)}"}
+    
+    @staticmethod
+    def _headlines_request(country: str, category: Optional[str]):
+        """Build the top-headlines query and response builder."""
+        params = {
+            "country": country.lower(),
+            "pageSize": 20
+        }
+        if category:
+            params["category"] = category.lower()
+        
+        def build(data: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "country": country,
+                "category": category,
+                "articles": [_format_article(article) for article in data.get("articles", [])],
+                "total_results": data.get("totalResults", 0),
+                "source": "NewsAPI",
+                "free_tier": "100 requests/day"
+            }
+        return "top-headlines", params, "News", build
+    
+    @staticmethod
+    def _search_request(query: str, language: str, sort_by: str):
+        """Build the everything-search query and response builder."""
+        params = {
+            "q": query,
+            "language": language,
+            "sortBy": sort_by,
+            "pageSize": 20
+        }
+        
+        def build(data: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "query": query,
+                "language": language,
+                "sort_by": sort_by,
+                "articles": [_format_article(article, with_content=True) for article in data.get("articles", [])],
+                "total_results": data.get("totalResults", 0),
+                "source": "NewsAPI",
+                "free_tier": "100 requests/day"
+            }
+        return "everything", params, "News search", build
+    
+    @staticmethod
+    def _sources_request(category: Optional[str], language: str):
+        """Build the sources query and response builder."""
+        params = {"language": language}
+        if category:
+            params["category"] = category.lower()
+        
+        def build(data: Dict[str, Any]) -> Dict[str, Any]:
+            sources = [_format_source(source) for source in data.get("sources", [])]
+            return {
+                "category": category,
+                "language": language,
+                "sources": sources,
+                "count": len(sources),
+                "source": "NewsAPI",
+                "free_tier": "100 requests/day"
+            }
+        return "sources", params, "News sources", build
+    
+    # Cached behind the access check so a hit never bypasses it
+    @ttl_cache(300, "news_headlines", NEWSAPI_URL)
+    def _top_headlines(self, country: str, category: Optional[str]) -> Dict[str, Any]:
+        """Fetch top headlines, served from cache for five minutes."""
+        return self._fetch(*self._headlines_request(country, category))
+    
+    @ttl_cache(300, "news_headlines", NEWSAPI_URL)
+    async def _atop_headlines(self, country: str, category: Optional[str]) -> Dict[str, Any]:
+        """Async _top_headlines."""
+        return await self._afetch(*self._headlines_request(country, category))
+    
+    def get_top_headlines(self, country: str = "us", category: Optional[str] = None) -> Dict[str, Any]:
+        """Get top headlines by country and category."""
+        if not self._check_feature_access():
+            return {"error": "News feature not available"}
+        return self._top_headlines(country, category)
+    
+    async def aget_top_headlines(self, country: str = "us", category: Optional[str] = None) -> Dict[str, Any]:
+        """Async variant of get_top_headlines."""
+        if not self._check_feature_access():
+            return {"error": "News feature not available"}
+        return await self._atop_headlines(country, category)
+    
+    def search_news(self, query: str, language: str = "en", sort_by: str = "publishedAt") -> Dict[str, Any]:
+        """Search for news articles."""
+        if not self._check_feature_access():
+            return {"error": "News feature not available"}
+        return self._fetch(*self._search_request(query, language, sort_by))
+    
+    async def asearch_news(self, query: str, language: str = "en", sort_by: str = "publishedAt") -> Dict[str, Any]:
+        """Async variant of search_news."""
+        if not self._check_feature_access():
+            return {"error": "News feature not available"}
+        return await self._afetch(*self._search_request(query, language, sort_by))
     
     def get_sources(self, category: Optional[str] = None, language: str = "en") -> Dict[str, Any]:
         """Get available news sources."""
         if not self._check_feature_access():
             return {"error": "News feature not available"}
-        
-        try:
-            api_key = os.getenv("NEWSAPI_KEY")
-            if not api_key:
-                return {
-                    "error": "NewsAPI key not configured",
-                    "setup_required": "Get free API key from https://newsapi.org/",
-                    "free_tier": "100 requests/day"
-                }
-            
-            url = "https://newsapi.org/v2/sources"
-            params = {
-                "apiKey": api_key,
-                "language": language
-            }
-            
-            if category:
-                params["category"] = category.lower()
-            
-            resp = requests.get(url, params=params, timeout=10)
-            
-            if resp.status_code == 200:
-                data = resp.json()
-                if data.get("status") == "ok":
-                    sources = []
-                    for source in data.get("sources", []):
-                        sources.append({
-                            "id": source.get("id", ""),
-                            "name": source.get("name", ""),
-                            "description": source.get("description", ""),
-                            "url": source.get("url", ""),
-                            "category": source.get("category", ""),
-                            "language": source.get("language", ""),
-                            "country": source.get("country", "")
-                        })
-                    
-                    return {
-                        "category": category,
-                        "language": language,
-                        "sources": sources,
-                        "count": len(sources),
-                        "source": "NewsAPI",
-                        "free_tier": "100 requests/day"
-                    }
-                else:
-                    return {"error": f"NewsAPI error: {data.get('message', 'Unknown error')}"}
-            elif resp.status_code == 401:
-                return {"error": "Invalid NewsAPI key - please check your API key"}
-            elif resp.status_code == 429:
-                return {"error": "NewsAPI rate limit exceeded - free tier allows 100 requests/day"}
-            else:
-                return {"error": f"News sources API error: {resp.status_code} - {resp.text}"}
-                
-        except requests.exceptions.Timeout:
-            return {"error": "News sources API request timed out"}
-        except requests.exceptions.RequestException as e:
-            return {"error": f"News sources API connection error: {str(e)}"}
-        except Exception as e:
-            return {"error": f"News sources error: {str(e)}"} 
\ No newline at end of file
+        return self._fetch(*self._sources_request(category, language))
+    
+    async def aget_sources(self, category: Optional[str] = None, language: str = "en") -> Dict[str, Any]:
+        """Async variant of get_sources."""
+        if not self._check_feature_access():
+            return {"error": "News feature not available"}
+        return await self._afetch(*self._sources_request(category, language))
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only record store behind Home Edition timers, reminders and notes.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+# Loaded by path: importing the astra.home_edition package runs the edition's
+# DRM start-up checks, which the store doesn't depend on
+_spec = importlib.util.spec_from_file_location(
+    "_record_log", Path(__file__).parent / "astra" / "home_edition" / "_record_log.py"
+)
+record_log = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(record_log)
+RecordLogStore = record_log.RecordLogStore
+
+
+class RecordingLogger:
+    """Collects the events a store logs."""
+    
+    def __init__(self):
+        self.events = []
+    
+    def warning(self, event, **kwargs):
+        self.events.append(event)
+    
+    def error(self, event, **kwargs):
+        self.events.append(event)
+
+
+def log_lines(path):
+    """Return the decoded records of an NDJSON log."""
+    return [json.loads(line) for line in path.read_bytes().splitlines()]
+
+
+def test_put_flush_replay(tmp_path):
+    """Flushed records are read back by a new store on the same log."""
+    path = tmp_path / "notes.log"
+    store = RecordLogStore(path, RecordingLogger())
+    store.put("a", {"id": "a", "title": "first"})
+    store.put("b", {"id": "b", "title": "second"})
+    store.flush()
+    
+    reopened = RecordLogStore(path, RecordingLogger())
+    assert reopened.values() == [{"id": "a", "title": "first"}, {"id": "b", "title": "second"}]
+
+
+def test_debounced_puts_are_written_once(tmp_path):
+    """A burst of puts is held in memory and written as one batch."""
+    path = tmp_path / "notes.log"
+    store = RecordLogStore(path, RecordingLogger(), delay=60)
+    for version in range(3):
+        store.put("a", {"id": "a", "version": version})
+    store.put("b", {"id": "b", "version": 0})
+    assert not path.exists()
+    
+    store.flush()
+    assert log_lines(path) == [{"id": "a", "version": 2}, {"id": "b", "version": 0}]
+
+
+def test_write_through_without_delay(tmp_path):
+    """delay=None appends each put immediately."""
+    path = tmp_path / "timers.log"
+    store = RecordLogStore(path, RecordingLogger(), delay=None)
+    store.put("a", {"id": "a"})
+    assert log_lines(path) == [{"id": "a"}]
+
+
+def test_compaction_keeps_latest_versions(tmp_path, monkeypatch):
+    """The log is rewritten once superseded records pile up."""
+    monkeypatch.setattr(record_log, "_LOG_COMPACT_MIN", 2)
+    path = tmp_path / "timers.log"
+    store = RecordLogStore(path, RecordingLogger(), delay=None)
+    for version in range(10):
+        store.put("a", {"id": "a", "version": version})
+    
+    assert len(log_lines(path)) <= 3
+    assert RecordLogStore(path, RecordingLogger()).get("a") == {"id": "a", "version": 9}
+
+
+def test_torn_final_line_is_truncated(tmp_path):
+    """A half-written last record is dropped and later appends stay readable."""
+    path = tmp_path / "notes.log"
+    path.write_bytes(b'{"id": "a"}\n{"id": "b", "ti')
+    logger = RecordingLogger()
+    store = RecordLogStore(path, logger, delay=None)
+    assert store.values() == [{"id": "a"}]
+    assert path.read_bytes() == b'{"id": "a"}\n'
+    assert logger.events
+    
+    store.put("c", {"id": "c"})
+    assert RecordLogStore(path, RecordingLogger()).values() == [{"id": "a"}, {"id": "c"}]
+
+
+def test_missing_final_newline_is_restored(tmp_path):
+    """A whole last record without its newline doesn't swallow the next append."""
+    path = tmp_path / "notes.log"
+    path.write_bytes(b'{"id": "a"}')
+    store = RecordLogStore(path, RecordingLogger(), delay=None)
+    store.put("b", {"id": "b"})
+    assert log_lines(path) == [{"id": "a"}, {"id": "b"}]
+
+
+def test_readers_get_copies(tmp_path):
+    """Editing a returned record changes neither the store nor its index."""
+    store = RecordLogStore(
+        tmp_path / "reminders.log",
+        RecordingLogger(),
+        delay=60,
+        index_key=lambda reminder: (reminder.get("status"),),
+    )
+    store.put("a", {"id": "a", "status": "pending"})
+    
+    store.get("a")["status"] = "done"
+    store.values()[0]["status"] = "done"
+    store.lookup("pending")[0]["status"] = "done"
+    store.lookup_matching(lambda status: True)[0]["status"] = "done"
+    
+    assert store.get("a") == {"id": "a", "status": "pending"}
+    assert store.lookup("pending") == [{"id": "a", "status": "pending"}]
+    assert store.lookup("done") == []
+
+
+def test_unreadable_legacy_files_are_set_aside(tmp_path):
+    """A corrupt legacy file is renamed to *.bad; good ones are imported and removed."""
+    good = tmp_path / "note_1.json"
+    good.write_text(json.dumps({"id": "note_1", "title": "kept"}))
+    bad = tmp_path / "note_2.json"
+    bad.write_text("{not json")
+    snapshot = tmp_path / "notes.json"
+    snapshot.write_text("[1, 2]")
+    
+    store = RecordLogStore(tmp_path / "notes.log", RecordingLogger())
+    store.import_snapshot(snapshot)
+    store.import_legacy(sorted(tmp_path.glob("note_*.json")))
+    
+    assert store.values() == [{"id": "note_1", "title": "kept"}]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "note_2.json.bad", "notes.json.bad", "notes.log"
+    ]